@@ -1,7 +1,7 @@
-from inspect import getmembers
-from typing import Callable, Iterator, Tuple, Type
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Tuple, Type
 
-from peewee import Field as DBField, Model as DBModel
+from peewee import Field as DBField, FieldAccessor, Model as DBModel
 
 DEPENDANT_PROPERTY_ATTR_NAME = 'property_deps'
 
@@ -14,15 +14,20 @@ def depends_on(*fields: DBField) -> Callable:
     return wrapper
 
 
+@lru_cache(maxsize=None)
 def get_properties_dependencies(
     model_class: Type[DBModel],
+) -> Tuple[Tuple[str, Tuple[DBField, ...]], ...]:
+    # Model members are fixed after class creation, so results are cached per model class
+    return tuple(_iter_properties_dependencies(model_class))
+
+
+def _iter_properties_dependencies(
+    model_class: Type[DBModel],
 ) -> Iterator[Tuple[str, Tuple[DBField, ...]]]:
-    for name, method in getmembers(
-        model_class,
-        lambda member: (isinstance(member, (property, Callable))),  # type: ignore
-    ):
-        # Get getter if property or method itself
-        method_fn = getattr(method, 'fget', method)
+    for name, member in iter_class_members(model_class):
+        # Get getter if property, wrapped function if class/static method or method itself
+        method_fn = getattr(member, 'fget', None) or getattr(member, '__func__', member)
         fields = tuple(
             # Need to re-get class attribute, otherwise child models will depend on parent fields
             getattr(model_class, field.name)
@@ -31,3 +36,19 @@ def get_properties_dependencies(
         )
         if fields:
             yield name, fields
+
+
+def iter_class_members(cls: type) -> Iterator[Tuple[str, Any]]:
+    '''
+    Walk raw class attributes through MRO without triggering descriptors.
+    Peewee field accessors are unwrapped to fields themselves.
+    '''
+    seen = set()
+    for klass in cls.__mro__:
+        for name, member in vars(klass).items():
+            if name in seen:
+                continue
+            seen.add(name)
+            if isinstance(member, FieldAccessor):
+                member = member.field
+            yield name, member
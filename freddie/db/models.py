@@ -1,4 +1,3 @@
-from inspect import getmembers
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -8,6 +7,7 @@ from typing import (
     Dict,
     Iterable,
     Tuple,
+    Type,
     Union,
 )
 
@@ -35,6 +35,7 @@ from peewee import (
     IntegerField,
     IPField,
     Model as DBModel,
+    ModelBase,
     Query,
     SmallIntegerField,
     TextField,
@@ -51,7 +52,7 @@ from playhouse.postgres_ext import (
 )
 
 from ..db import Database, DatabaseManager as _DatabaseManager, UnpooledDatabase
-from .depends_decorator import depends_on, get_properties_dependencies
+from .depends_decorator import depends_on, get_properties_dependencies, iter_class_members
 from .fields import ManyToManyField
 
 if TYPE_CHECKING:
@@ -67,13 +68,25 @@ else:
     DatabaseManager = _DatabaseManager
 
 
-class Model(DBModel):
+class ModelMetaclass(ModelBase):
+    def __new__(mcs, name, bases, attrs, **kwargs):  # type: ignore
+        cls = super().__new__(mcs, name, bases, attrs, **kwargs)
+        # Model metadata is set by peewee after class creation, so it's not available
+        # in __init_subclass__; store primary key lookups for hot paths instead
+        cls._pk_field = cls._meta.primary_key
+        cls._pk_name = getattr(cls._pk_field, 'name', None)
+        return cls
+
+
+class Model(DBModel, metaclass=ModelMetaclass):
     manager: DatabaseManager
     manytomany: Dict[str, ManyToManyField] = {}
+    _pk_field: DBField
+    _pk_name: str
 
     @property
     def pk(self) -> Any:
-        return getattr(self, self._meta.primary_key.name)
+        return getattr(self, self._pk_name)
 
     @classmethod
     def db(cls) -> Union[Database, UnpooledDatabase, None]:
@@ -81,7 +94,7 @@ class Model(DBModel):
 
     @classmethod
     def pk_field(cls) -> DBField:
-        return cls._meta.primary_key
+        return cls._pk_field
 
     @classmethod
     def fields(cls) -> 'FieldsMap':
@@ -89,20 +102,21 @@ class Model(DBModel):
 
     @classmethod
     def map_props_dependencies(cls) -> 'PropsDependenciesMap':
-        return {prop: deps for prop, deps in get_properties_dependencies(cls)}
+        return dict(get_properties_dependencies(cls))
 
     @classmethod
     def select_only(
         cls, *fields: Union[str, DBField, DBModel], join_type: str = JOIN.LEFT_OUTER
     ) -> Query:
-        selected_fields = {cls._meta.primary_key}
-        joined_models = set()
+        # Dicts are used as ordered sets to keep columns order (and so SQL) deterministic
+        selected_fields = {cls._pk_field: None}
+        joined_models: Dict[Type[DBModel], None] = {}
         for field in fields:
             field = cls._meta.fields.get(field) if isinstance(field, str) else field
             if field is not None:
-                selected_fields.add(field)
+                selected_fields[field] = None
             if isinstance(field, type) and issubclass(field, DBModel):
-                joined_models.add(field)
+                joined_models[field] = None
         query = cls.select(*selected_fields)
         for model in joined_models:
             query = query.join_from(cls, model, join_type)
@@ -118,13 +132,11 @@ class ThroughModel(DBModel):
     def setup_related_m2m_fields(cls) -> None:
         related_fields_found = 0
         foreign_keys: Iterable[ForeignKeyField] = (
-            fk for _, fk in getmembers(cls, lambda f: isinstance(f, ForeignKeyField))
+            fk for _, fk in iter_class_members(cls) if isinstance(fk, ForeignKeyField)
         )
         for fk in foreign_keys:
             rel_model: Model = fk.rel_model
-            for field_name, field in getmembers(
-                rel_model, lambda f: isinstance(f, ManyToManyField)
-            ):
+            for field_name, field in _get_m2m_fields(rel_model):
                 if field.through_model_name != cls.__name__:
                     continue
                 field.through_model = cls
@@ -132,6 +144,21 @@ class ThroughModel(DBModel):
                 related_fields_found += 1
 
 
+_M2M_FIELDS_CACHE: Dict[type, Tuple[Tuple[str, ManyToManyField], ...]] = {}
+
+
+def _get_m2m_fields(model: type) -> Tuple[Tuple[str, ManyToManyField], ...]:
+    fields = _M2M_FIELDS_CACHE.get(model)
+    if fields is None:
+        fields = tuple(
+            (name, field)
+            for name, field in iter_class_members(model)
+            if isinstance(field, ManyToManyField)
+        )
+        _M2M_FIELDS_CACHE[model] = fields
+    return fields
+
+
 FieldsMap = Dict[str, DBField]
 PropsDependenciesMap = Dict[str, Tuple[DBField, ...]]
 
@@ -1,18 +1,57 @@
-from collections import defaultdict
-from operator import attrgetter
-from typing import Any, AsyncIterator, DefaultDict, Dict, Iterable, NamedTuple, Tuple
+from asyncio import gather
+from itertools import chain
+from operator import attrgetter, itemgetter
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Tuple,
+    Type,
+)
 
 from peewee import JOIN, SQL, Check, Expression, Function, Query, fn
 
 from .fields import ManyToManyField
 from .models import Model
 
+PREFETCH_JOIN = 'join'
+PREFETCH_SEPARATE = 'prefetch'
+PREFETCH_STRATEGIES = (PREFETCH_JOIN, PREFETCH_SEPARATE)
+
 
-class Prefetch(NamedTuple):
+class _PrefetchFields(NamedTuple):
     field: 'ManyToManyField'
     attr_name: str
     ids_only: bool = False
     relation_fields: Iterable[str] = []
+    strategy: str = PREFETCH_JOIN
+
+
+class Prefetch(_PrefetchFields):
+    '''
+    Many-to-many relation prefetching config.
+
+    Available strategies:
+    * join (default): single query on through table joined with related table;
+      related row is fetched again for every object it is linked to.
+    * prefetch: relation keys are fetched from through table first, then distinct
+      related rows are fetched by PK in a second query; preferable when many objects
+      share the same related ones (i.e. wide related table with high fan-out).
+    '''
+
+    __slots__ = ()
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> 'Prefetch':
+        # Invalid strategy is reported on declaration rather than on querying
+        prefetch = super().__new__(cls, *args, **kwargs)
+        if prefetch.strategy not in PREFETCH_STRATEGIES:
+            raise ValueError(f'Invalid prefetch strategy: {prefetch.strategy}')
+        return prefetch
 
 
 async def prefetch_related(
@@ -20,58 +59,195 @@ async def prefetch_related(
     config: Iterable[Prefetch],
     as_objects: bool = True,
 ) -> AsyncIterator[Model]:
-    ids = set(map(attrgetter('id'), objects))
-    prefetched_data: Dict[str, DefaultDict] = {}
-    for (field, attr_name, ids_only, relation_fields) in config:
-        mapping = defaultdict(list)
-        related_model = field.rel_model
-        related_model_keys = field.rel_model_keys
-        through_model = field.through_model
-        query = through_model.select()
-        if not ids_only:
-            query = through_model.select(through_model, related_model).join(related_model)
-        query = query.where(field.model_fk << ids).dicts()
-        for relation in await through_model.manager.execute(query):
-            obj_id = relation[field.model_fk.name]
-            related_id = relation[field.rel_model_fk.name]
-            related = related_id
-            if not ids_only:
-                related = {
-                    **{key: relation.get(key) for key in related_model_keys},
-                    field.rel_model.pk_field().name: related_id,
-                }
-                if as_objects:
-                    related = related_model(**related)
-            if not ids_only and relation_fields:
-                for relation_field in relation_fields:
-                    if as_objects:
-                        setattr(related, relation_field, relation[relation_field])
-                    else:
-                        related[relation_field] = relation[relation_field]
-            mapping[obj_id].append(related)
+    # Objects are iterated more than once, so generators must be materialized
+    objects = list(objects)
+    if not objects:
+        return
+    config = tuple(config)
+    # Relations refer to the model field (usually PK) that is not necessarily named "id"
+    lookup_names = [prefetch.field.model_fk.rel_field.name for prefetch in config]
+    ids_by_lookup = {
+        lookup_name: {getattr(obj, lookup_name) for obj in objects} for lookup_name in lookup_names
+    }
+    results = await execute_many(
+        _build_relations_query(prefetch, ids_by_lookup[lookup_name])
+        for prefetch, lookup_name in zip(config, lookup_names)
+    )
+    results = await _fetch_related_separately(config, results)
 
-        prefetched_data[attr_name] = mapping
+    prefetched_data: Dict[str, Tuple[str, Dict[Any, list]]] = {}
+    for prefetch, lookup_name, relations in zip(config, lookup_names, results):
+        # Every relation row belongs to one of requested objects, so lists are pre-created
+        mapping: Dict[Any, list] = {obj_id: [] for obj_id in ids_by_lookup[lookup_name]}
+        prefetched_data[prefetch.attr_name] = (lookup_name, mapping)
+        unpack = _make_row_unpacker(prefetch, as_objects)
+        for row in relations:
+            obj_id, related = unpack(row)
+            mapping[obj_id].append(related)
 
+    for attr_name, (lookup_name, mapped) in prefetched_data.items():
+        for obj in objects:
+            setattr(obj, attr_name, mapped[getattr(obj, lookup_name)])
     for obj in objects:
-        for attr_name, mapped in prefetched_data.items():
-            setattr(obj, attr_name, mapped[obj.id])
         yield obj
 
 
+def _make_row_unpacker(prefetch: Prefetch, as_objects: bool) -> Callable[[Any], Tuple[Any, Any]]:
+    # Per-prefetch constants are resolved once, not on every row
+    if prefetch.ids_only:
+        return itemgetter(0, 1)
+
+    related_model = prefetch.field.rel_model
+    key_names = tuple(prefetch.field.rel_model_keys)
+    relation_fields = tuple(prefetch.relation_fields)
+    related_columns = slice(2 + len(relation_fields), None)
+    relation_columns = slice(2, related_columns.start)
+
+    def unpack(row: Any) -> Tuple[Any, Any]:
+        related = dict(zip(key_names, row[related_columns]))
+        if as_objects:
+            related = _construct(related_model, related)
+        if not relation_fields:
+            return row[0], related
+        for relation_field, value in zip(relation_fields, row[relation_columns]):
+            if as_objects:
+                setattr(related, relation_field, value)
+            else:
+                related[relation_field] = value
+        return row[0], related
+
+    return unpack
+
+
+def _build_relations_query(prefetch: Prefetch, ids: Iterable[Any]) -> Tuple[Any, Query]:
+    field = prefetch.field
+    through_model = field.through_model
+    # Rows are tuples of (obj_id, related_id, *relation_fields, *rel_model_keys)
+    columns = [field.model_fk, field.rel_model_fk]
+    if not prefetch.ids_only:
+        columns.extend(getattr(through_model, name) for name in prefetch.relation_fields)
+    is_joined = not prefetch.ids_only and prefetch.strategy == PREFETCH_JOIN
+    if is_joined:
+        columns.extend(_get_related_columns(field))
+    query = through_model.select(*columns)
+    if is_joined:
+        query = query.join(field.rel_model)
+    return through_model.manager, query.where(field.model_fk << list(ids)).tuples()
+
+
+async def _fetch_related_separately(config: Tuple[Prefetch, ...], results: List[Any]) -> List[Any]:
+    # Complete relations rows fetched without join by distinct related rows
+    results = list(results)
+    separate = []
+    queries = []
+    for index, prefetch in enumerate(config):
+        if prefetch.ids_only or prefetch.strategy != PREFETCH_SEPARATE:
+            continue
+        relations = results[index] = list(results[index])
+        model = prefetch.field.rel_model
+        related_ids = list({row[1] for row in relations})
+        query = model.select(*_get_related_columns(prefetch.field))
+        query = query.where(model.pk_field() << related_ids).tuples()
+        separate.append((index, prefetch))
+        queries.append((model.manager, query))
+    if not queries:
+        return results
+
+    for (index, prefetch), related_rows in zip(separate, await execute_many(queries)):
+        pk_index = tuple(prefetch.field.rel_model_keys).index(prefetch.field.rel_model_pk.name)
+        related_by_pk = {row[pk_index]: tuple(row) for row in related_rows}
+        results[index] = [
+            tuple(row) + related_by_pk[row[1]] for row in results[index] if row[1] in related_by_pk
+        ]
+    return results
+
+
+def _get_related_columns(field: ManyToManyField) -> List[Any]:
+    return [field.rel_model._meta.fields[key] for key in field.rel_model_keys]
+
+
+def _construct(model: Type[Model], data: Dict[str, Any]) -> Model:
+    # Hydrate instance from already fetched row bypassing Model.__init__ & fields descriptors,
+    # same as peewee does for rows of SELECT queries
+    instance = model.__new__(model)
+    instance.__data__ = data
+    instance._dirty = set()
+    instance.__rel__ = {}
+    return instance
+
+
 async def get_related(pk: Any, config: Iterable[Prefetch]) -> Dict[str, Tuple[Any, ...]]:
+    config = tuple(config)
+    if not config:
+        return {}
+    queries = []
+    for prefetch in config:
+        model = prefetch.field.rel_model
+        retrieved_fields = [model.pk_field()] if prefetch.ids_only else None
+        queries.append((model.manager, prefetch.field(pk).get(fields=retrieved_fields)))
+    results = await execute_many(queries)
+
     related = {}
-    for (field, attr_name, ids_only, relation_fields) in config:
-        model = field.rel_model
-        builder = field(pk)
-        retrieved_fields = [model.pk_field()] if ids_only else None
-        query = builder.get(fields=retrieved_fields)
-        items = await model.manager.execute(query)
-        if ids_only:
-            items = map(attrgetter(model.pk_field().name), items)
-        related[attr_name] = tuple(items)
+    for prefetch, items in zip(config, results):
+        if prefetch.ids_only:
+            items = map(attrgetter(prefetch.field.rel_model.pk_field().name), items)
+        related[prefetch.attr_name] = tuple(items)
     return related
 
 
+def related_ids_subquery(field: ManyToManyField) -> Function:
+    '''
+    Array of related objects IDs correlated with outer query rows,
+    so relations are selected along with objects instead of a separate query.
+    '''
+    through_model = field.through_model
+    query = through_model.select(field.rel_model_fk).where(
+        field.model_fk == field.model_fk.rel_field
+    )
+    return fn.ARRAY(query)
+
+
+def is_subquery_prefetchable(prefetch: Prefetch) -> bool:
+    # Through table must be in the same database as the model
+    field = prefetch.field
+    return prefetch.ids_only and field.through_model._meta.database is field.model._meta.database
+
+
+def iter_objects(results: Iterable[Model]) -> Iterator[Model]:
+    '''
+    One-pass iteration over select query results:
+    objects are not cached by results wrapper, so they're freed once consumed.
+    '''
+    wrapper = getattr(results, '_result_wrapper', None)
+    if wrapper is None:
+        return iter(results)
+    iterator: Iterator[Model] = wrapper.iterator()
+    return iterator
+
+
+async def execute_many(queries: Iterable[Tuple[Any, Query]]) -> List[Any]:
+    '''Run independent queries concurrently where possible, each with its own database manager'''
+    queries = list(queries)
+    if len(queries) == 1 or not _is_concurrency_safe(manager for manager, _ in queries):
+        return [await manager.execute(query) for manager, query in queries]
+    return list(await gather(*(manager.execute(query) for manager, query in queries)))
+
+
+def _is_concurrency_safe(managers: Iterable[Any]) -> bool:
+    # Concurrent queries run in separate tasks: they don't share task-bound transaction
+    # connection and can't get another connection from unpooled database
+    for manager in managers:
+        database = manager.database
+        if database.transaction_depth_async() > 0 or database.max_connections <= 1:
+            return False
+    return True
+
+
+async def add_related(pk: Any, field: ManyToManyField, ids: Iterable[Any]) -> None:
+    '''Link new object to related ones: single INSERT, nothing to clear beforehand'''
+    await field.through_model.manager.execute(field(pk).add(*ids))
+
+
 async def set_related(pk: Any, field: ManyToManyField, ids: Iterable[Any] = None) -> None:
     manager = field.through_model.manager
     builder = field(pk)
@@ -83,16 +259,47 @@ async def set_related(pk: Any, field: ManyToManyField, ids: Iterable[Any] = None
             await manager.execute(insert_query)
 
 
+async def set_related_bulk(
+    field: ManyToManyField, pairs: Iterable[Tuple[Any, Iterable[Any]]]
+) -> None:
+    '''Replace relations of many objects at once: single DELETE & INSERT in one transaction'''
+    pairs = [(pk, tuple(ids or ())) for pk, ids in pairs]
+    if not pairs:
+        return
+    through_model = field.through_model
+    manager = through_model.manager
+    model_name, rel_model_name = field.model_name, field.rel_model_name
+    rows = list(
+        chain.from_iterable(
+            ({rel_model_name: related_id, model_name: pk} for related_id in ids)
+            for pk, ids in pairs
+        )
+    )
+    delete_query = through_model.delete().where(field.model_fk << [pk for pk, _ in pairs])
+    async with manager.atomic():
+        await manager.execute(delete_query)
+        if rows:
+            await manager.execute(through_model.insert_many(rows))
+
+
 __all__ = (
     'Check',
     'Expression',
     'Query',
     'JOIN',
     'Prefetch',
+    'PREFETCH_JOIN',
+    'PREFETCH_SEPARATE',
     'SQL',
     'fn',
     'Function',
     'prefetch_related',
     'get_related',
+    'related_ids_subquery',
+    'is_subquery_prefetchable',
+    'iter_objects',
+    'execute_many',
+    'add_related',
     'set_related',
+    'set_related_bulk',
 )
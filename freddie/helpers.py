@@ -1,4 +1,6 @@
+import json
 import logging
+from functools import lru_cache
 from inspect import (
     Parameter,
     Signature,
@@ -8,30 +10,52 @@ from inspect import (
 )
 from itertools import chain
 from operator import attrgetter
+from types import GeneratorType, ModuleType
 from typing import (
     Any,
     AsyncIterable,
     Awaitable,
     Callable,
+    Dict,
     Iterable,
     Iterator,
     List,
     Mapping,
+    Optional,
     Tuple,
     Type,
 )
 
 from fastapi import Depends
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from starlette.concurrency import run_in_threadpool
 
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover
+    orjson = None
+
+
+# Iterability depends on object type only, so ABC isinstance checks are done once per type
+_is_iterable_type: Dict[type, bool] = {
+    **dict.fromkeys((list, tuple, set, frozenset, dict, GeneratorType), True),
+    **dict.fromkeys((str, bytes, int, float, bool, type(None)), False),
+}
+
 
 def is_mappable(obj: Any) -> bool:
-    return isinstance(obj, Mapping)
+    return type(obj) is dict or isinstance(obj, Mapping)
 
 
 def is_iterable(obj: Any) -> bool:
-    return isinstance(obj, Iterable) and not isinstance(obj, (str, bytes, BaseModel))
+    obj_type = type(obj)
+    result = _is_iterable_type.get(obj_type)
+    if result is None:
+        result = isinstance(obj, Iterable) and not isinstance(obj, (str, bytes, BaseModel))
+        _is_iterable_type[obj_type] = result
+    return result
 
 
 def is_async_iterable(obj: Any) -> bool:
@@ -42,23 +66,71 @@ def is_awaitable(obj: Any) -> bool:
     return isinstance(obj, Awaitable)
 
 
+RUN_INLINE_FLAG = '__freddie_run_inline__'
+
+
+def run_inline(handler: Callable) -> Callable:
+    '''Mark cheap synchronous handler to be called in event loop instead of threadpool'''
+    setattr(handler, RUN_INLINE_FLAG, True)
+    return handler
+
+
 async def run_async_or_thread(handler: Callable, *args: Any, **kwargs: Any) -> Any:
     if iscoroutinefunction(handler):
         return await handler(*args, **kwargs)
-    elif isasyncgenfunction(handler):
+    elif isasyncgenfunction(handler) or getattr(handler, RUN_INLINE_FLAG, False):
         return handler(*args, **kwargs)
     return await run_in_threadpool(handler, *args, **kwargs)
 
 
-def distinct(sequence: Iterable, key_getter: Callable) -> Iterator:
-    seen = set()
+# Same options as JSONResponse uses, while types json can't encode are converted
+# by FastAPI encoder only where they're met, instead of walking the whole data beforehand
+_json_encoder = json.JSONEncoder(
+    ensure_ascii=False,
+    allow_nan=False,
+    indent=None,
+    separators=(',', ':'),
+    default=jsonable_encoder,
+)
+
+
+def dumps_json(data: Any) -> bytes:
+    '''Encode data to JSON as JSONResponse does'''
+    try:
+        return _json_encoder.encode(data).encode('utf-8')
+    except TypeError:
+        # Dict keys json can't encode (e.g. UUID) are converted by FastAPI encoder
+        return _json_encoder.encode(jsonable_encoder(data)).encode('utf-8')
+
+
+# Same options as ORJSONResponse uses, while dates & dataclasses are left to FastAPI encoder,
+# as orjson formats some of them in its own way
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_SERIALIZE_NUMPY
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+
+def dumps_orjson(data: Any) -> bytes:
+    '''Encode data to JSON as ORJSONResponse does'''
+    assert orjson is not None, 'orjson must be installed to use dumps_orjson'
+    result: bytes = orjson.dumps(data, default=jsonable_encoder, option=_ORJSON_OPTIONS)
+    return result
+
+
+def distinct(sequence: Iterable, key_getter: Callable) -> List:
+    # Dict keeps insertion order, so first occurrence of each key wins
+    seen: Dict[Any, Any] = {}
     for item in sequence:
-        key = key_getter(item)
-        if key not in seen:
-            seen.add(key)
-            yield item
+        seen.setdefault(key_getter(item), item)
+    return list(seen.values())
 
 
+@lru_cache(maxsize=512)
 def extract_types(type_: Type) -> Tuple[Type, ...]:
     # Generic types like Union or List have undocumented __origin__ attribute
     origin = getattr(type_, '__origin__', None)
@@ -66,6 +138,11 @@ def extract_types(type_: Type) -> Tuple[Type, ...]:
 
 
 def is_valid_type(type_: Type, whitelist: Iterable[Type]) -> bool:
+    return _is_valid_type(type_, tuple(whitelist))
+
+
+@lru_cache(maxsize=512)
+def _is_valid_type(type_: Type, whitelist: Tuple[Type, ...]) -> bool:
     is_valid = lambda valid: issubclass(type_, valid)
     return any(map(is_valid, whitelist))
 
@@ -81,9 +158,9 @@ def patch_endpoint_signature(
 ) -> Callable:
     signature = get_signature(endpoint)
     parameters = chain(
-        _build_dependencies_parameters(dependencies or ()),
+        _build_dependencies_parameters(tuple(dependencies or ())),
         _get_signature_parameters(signature),
-        _get_signature_parameters(get_signature(handler)) if handler else [],
+        _get_handler_parameters(handler) if handler else (),
     )
     # Parameters defined in handler function can overlap predefined ones from dependencies,
     # so we need to filter it out, as dependency/endpoint params have greater priority
@@ -99,14 +176,19 @@ def patch_endpoint_signature(
     return endpoint
 
 
-def _build_dependencies_parameters(dependencies: Iterable) -> Iterator[Parameter]:
-    for (dependency_name, dependency_type) in dependencies:
-        yield Parameter(
+@lru_cache(maxsize=256)
+def _build_dependencies_parameters(
+    dependencies: Tuple[Tuple[str, Type], ...]
+) -> Tuple[Parameter, ...]:
+    return tuple(
+        Parameter(
             name=dependency_name,
             kind=Parameter.KEYWORD_ONLY,
             annotation=dependency_type,
             default=Depends(),
         )
+        for (dependency_name, dependency_type) in dependencies
+    )
 
 
 def _get_signature_parameters(signature: Signature) -> Iterator[Parameter]:
@@ -115,6 +197,43 @@ def _get_signature_parameters(signature: Signature) -> Iterator[Parameter]:
             yield param
 
 
+def _get_handler_parameters(handler: Callable) -> Tuple[Parameter, ...]:
+    # Bound methods are new objects for every instance, so parameters are cached by function
+    func = getattr(handler, '__func__', None)
+    if func is None:
+        return tuple(_get_signature_parameters(get_signature(handler)))
+    return _get_method_parameters(func)
+
+
+@lru_cache(maxsize=None)
+def _get_method_parameters(func: Callable) -> Tuple[Parameter, ...]:
+    # Handlers signatures are fixed after declaration, while endpoints are new closures each time
+    parameters = tuple(get_signature(func).parameters.values())
+    if parameters and parameters[0].kind in _POS_PARAM_KINDS:
+        # Skip self/cls, same as signature of bound method does
+        parameters = parameters[1:]
+    return tuple(param for param in parameters if param.kind in _ENDPOINT_PARAM_KINDS)
+
+
+@lru_cache(maxsize=None)
+def get_flagged_members_names(cls: type, flag: str) -> Tuple[str, ...]:
+    '''
+    Names of class callable members marked with flag attribute,
+    sorted by name as inspect.getmembers does, but collected once per class.
+    '''
+    names = set()
+    seen = set()
+    for klass in cls.__mro__:
+        for name, member in vars(klass).items():
+            if name in seen:
+                continue
+            seen.add(name)
+            member = getattr(member, '__func__', member)
+            if callable(member) and hasattr(member, flag):
+                names.add(name)
+    return tuple(sorted(names))
+
+
 SQL_LOGGER_NAME = 'peewee'
 
 
@@ -1,11 +1,39 @@
 import re
+import warnings
+from asyncio import Semaphore, gather
 from enum import Enum
-from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Pattern, Set, Type
+from functools import lru_cache
+from inspect import getattr_static, isasyncgenfunction, iscoroutinefunction, isfunction
+from operator import attrgetter
+from threading import RLock
+from typing import (
+    AbstractSet,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    Type,
+)
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseConfig, BaseModel, ConstrainedStr, create_model
+from pydantic.fields import ModelField
 
-from .helpers import is_async_iterable, is_awaitable, is_iterable, is_mappable
+from .helpers import dumps_json, is_async_iterable, is_awaitable, is_iterable, is_mappable
+
+_optional_schemas_lock = RLock()
+STREAM_CHUNK_SIZE = 64 * 1024
+JSONEncoder = Callable[[Any], bytes]
+_CONFIG_FIELDS_SETS_OPTIONS = ('default_readable_fields', 'read_only_fields', 'write_only_fields')
 
 
 class SchemaConfig(BaseConfig):
@@ -14,15 +42,60 @@ class SchemaConfig(BaseConfig):
     default_readable_fields: 'SchemaFields' = set()
     read_only_fields: 'SchemaFields' = set()
     write_only_fields: 'SchemaFields' = set()
+    # Objects with dynamic values are serialized in separate tasks if greater than 1,
+    # so their DB lookups don't see caller's transaction (connection is bound to task)
+    serialize_concurrency: int = 1
 
 
 class Schema(BaseModel):
     __config__: Type[SchemaConfig]
-    _cache: Dict[str, Any] = {}
+    _all_fields: FrozenSet[str] = frozenset()
+    _read_only_fields: FrozenSet[str] = frozenset()
+    _write_only_fields: FrozenSet[str] = frozenset()
+    _readable_fields: FrozenSet[str] = frozenset()
+    _writable_fields: FrozenSet[str] = frozenset()
+    _default_readable_fields: FrozenSet[str] = frozenset()
+    # Lazily computed values, reset for each subclass
+    _optional_schemas: Dict[str, 'SchemaClass'] = {}
+    _fields_max_length: Dict[str, Optional[int]] = {}
+    _default_response_fields_config: Optional['ResponseFieldsConfig'] = None
+    _full_response_fields_config: Optional['ResponseFieldsConfig'] = None
+    _default_serialization_plan: Optional['SerializationPlan'] = None
+    _full_serialization_plan: Optional['SerializationPlan'] = None
+    _json_native_fields: Optional[bool] = None
 
     def __init_subclass__(cls, **kwargs: Any):
         super().__init_subclass__()
-        cls._cache = {}
+        cls._optional_schemas = {}
+        cls._fields_max_length = {}
+        cls._default_response_fields_config = None
+        cls._full_response_fields_config = None
+        cls._default_serialization_plan = None
+        cls._full_serialization_plan = None
+        cls._json_native_fields = None
+        cls.setup_fields_sets()
+
+    @classmethod
+    def setup_fields_sets(cls) -> None:
+        # Fields sets are fixed after class creation, so there's no need to recompute them
+        config = cls.__config__
+        cls._all_fields = frozenset(cls.__fields__.keys())
+        for option in _CONFIG_FIELDS_SETS_OPTIONS:
+            configured_fields = frozenset(getattr(config, option))
+            unknown_fields = configured_fields - cls._all_fields
+            if unknown_fields:
+                warnings.warn(
+                    f'{cls.__name__} config {option} has unknown fields: {unknown_fields}'
+                )
+            # Config class is created for each schema, so it's safe to be frozen in place
+            setattr(config, option, configured_fields)
+        cls._read_only_fields = cls._all_fields & config.read_only_fields
+        cls._write_only_fields = cls._all_fields & config.write_only_fields
+        cls._readable_fields = cls._all_fields - cls._write_only_fields
+        cls._writable_fields = cls._all_fields - cls._read_only_fields
+        cls._default_readable_fields = (
+            cls._all_fields & config.default_readable_fields or cls._readable_fields
+        )
 
     class Config(SchemaConfig):
         ...
@@ -30,17 +103,22 @@ class Schema(BaseModel):
     @classmethod
     def optional(cls, class_name: str = None) -> 'SchemaClass':
         class_name = class_name or f'{cls.__name__}Optional'
-        model = cls._cache.get(class_name)
-        if model is None:
-            fields = {
-                field_name: (field.type_, None) for field_name, field in cls.__fields__.items()
-            }
-            model = create_model(
-                class_name, __base__=cls, __module__=cls.__module__, **fields  # type: ignore
-            )
-            # Prevent class from recreation on each call,
-            # otherwise OpenAPI schema generation is broken
-            cls._cache[class_name] = model
+        model = cls._optional_schemas.get(class_name)
+        if model is not None:
+            return model
+        with _optional_schemas_lock:
+            # Check again, as model could be created while waiting for the lock
+            model = cls._optional_schemas.get(class_name)
+            if model is None:
+                fields = {
+                    field_name: (field.type_, None) for field_name, field in cls.__fields__.items()
+                }
+                model = create_model(
+                    class_name, __base__=cls, __module__=cls.__module__, **fields  # type: ignore
+                )
+                # Prevent class from recreation on each call,
+                # otherwise OpenAPI schema generation is broken
+                cls._optional_schemas[class_name] = model
         return model
 
     @classmethod
@@ -49,29 +127,33 @@ class Schema(BaseModel):
 
     @classmethod
     def get_read_only_fields(cls) -> 'SchemaFields':
-        return cls.__config__.read_only_fields & set(cls.__fields__.keys())
+        return cls._read_only_fields
 
     @classmethod
     def get_write_only_fields(cls) -> 'SchemaFields':
-        return cls.__config__.write_only_fields & set(cls.__fields__.keys())
+        return cls._write_only_fields
 
     @classmethod
     def get_readable_fields(cls) -> 'SchemaFields':
-        return set(cls.__fields__.keys()) - cls.get_write_only_fields()
+        return cls._readable_fields
 
     @classmethod
     def get_writable_fields(cls) -> 'SchemaFields':
-        return set(cls.__fields__.keys()) - cls.get_read_only_fields()
+        return cls._writable_fields
 
     @classmethod
     def get_default_readable_fields(cls) -> 'SchemaFields':
-        return (
-            cls.__config__.default_readable_fields & set(cls.__fields__.keys())
-            or cls.get_readable_fields()
-        )
+        return cls._default_readable_fields
 
     @classmethod
     def get_field_max_length(cls, field_name: str) -> Optional[int]:
+        max_lengths = cls._fields_max_length
+        if field_name not in max_lengths:
+            max_lengths[field_name] = cls._get_field_max_length(field_name)
+        return max_lengths[field_name]
+
+    @classmethod
+    def _get_field_max_length(cls, field_name: str) -> Optional[int]:
         field = cls.__fields__.get(field_name)
         if not field:
             return None
@@ -87,7 +169,7 @@ class Schema(BaseModel):
 
     @classmethod
     def get_default_response_fields_config(cls) -> 'ResponseFieldsConfig':
-        config = cls._cache.get('default_response_fields_config')
+        config = cls._default_response_fields_config
         if config is None:
             config = {}
             for field_name in cls.get_default_readable_fields():
@@ -97,64 +179,222 @@ class Schema(BaseModel):
                 else:
                     subfields = set()
                 config[field_name] = subfields
-            cls._cache['default_response_fields_config'] = config
+            cls._default_response_fields_config = config
         return config
 
     @classmethod
     def get_full_response_fields_config(cls) -> 'ResponseFieldsConfig':
-        config = {}
-        for field_name in cls.get_readable_fields():
-            nested_model = cls.__fields__[field_name].type_
-            if is_subschema(nested_model):
-                subfields = nested_model.get_readable_fields()
-            else:
-                subfields = set()
-            config[field_name] = subfields
+        config = cls._full_response_fields_config
+        if config is None:
+            config = {}
+            for field_name in cls.get_readable_fields():
+                nested_model = cls.__fields__[field_name].type_
+                if is_subschema(nested_model):
+                    subfields = nested_model.get_readable_fields()
+                else:
+                    subfields = set()
+                config[field_name] = subfields
+            cls._full_response_fields_config = config
         return config
 
     @classmethod
     async def serialize(
         cls, obj: Any, fields: Optional[Mapping] = None, jsonable: bool = True, full: bool = False
     ) -> Any:
+        serialized = await cls._serialize_planned(obj, cls._get_serialization_plan(fields, full))
+        if not jsonable or (cls._has_json_native_fields() and _is_json_native(serialized)):
+            return serialized
+        return jsonable_encoder(serialized)
+
+    @classmethod
+    def _has_json_native_fields(cls) -> bool:
+        '''
+        Whether all fields are declared with JSON-native types,
+        so serialized data is worth checking before encoding it.
+        '''
+        native = cls._json_native_fields
+        if native is None:
+            # Self-referencing schemas are considered non-native
+            cls._json_native_fields = False
+            native = all(
+                field.type_._has_json_native_fields()
+                if is_subschema(field.type_)
+                else _is_json_native_type(field.type_)
+                for field in cls.__fields__.values()
+            )
+            cls._json_native_fields = native
+        return native
+
+    @classmethod
+    async def _serialize_planned(cls, obj: Any, plan: 'SerializationPlan') -> Any:
         if is_async_iterable(obj):
             obj = [obj async for obj in obj]
+        elif not is_mappable(obj) and is_iterable(obj) and not isinstance(obj, (list, tuple)):
+            # Iterators are materialized to be walked again if sync serialization bails out
+            obj = list(obj)
+        if type(obj) not in plan.async_types:
+            try:
+                return cls._serialize_sync(obj, plan)
+            except _AsyncSerializationRequired:
+                pass
+        return await cls._serialize_async(obj, plan)
+
+    @classmethod
+    def _serialize_sync(cls, obj: Any, plan: 'SerializationPlan') -> Any:
+        '''
+        Fast path without coroutines for objects with plain attributes only.
+        Raises _AsyncSerializationRequired before calling or consuming any dynamic value.
+        '''
         is_mapping = is_mappable(obj)
         if not is_mapping and is_iterable(obj):
-            return [await cls.serialize(item, fields, jsonable=jsonable, full=full) for item in obj]
-        if not fields:
-            fields = (
-                cls.get_full_response_fields_config()
-                if full
-                else cls.get_default_response_fields_config()
-            )
+            if not isinstance(obj, (list, tuple)):
+                raise _AsyncSerializationRequired
+            return [cls._serialize_sync(item, plan) for item in obj]
+        if not is_mapping:
+            obj_type = obj.__class__
+            if obj_type in plan.async_types:
+                raise _AsyncSerializationRequired
+            if obj_type not in plan.checked_types:
+                if _has_dynamic_attributes(obj_type, plan.names):
+                    # Async properties and methods are left to be evaluated once by async path
+                    plan.async_types.add(obj_type)
+                    raise _AsyncSerializationRequired
+                plan.checked_types.add(obj_type)
         serialized = {}
-        for field_name, subfields in fields.items():
-            if field_name not in cls.get_readable_fields():
-                continue
-            field = cls.__fields__[field_name]
+        for field in plan:
+            field_name = field.name
+            if is_mapping:
+                value = obj.get(field_name, None)
+            else:
+                try:
+                    value = field.getter(obj)
+                except AttributeError:
+                    value = None
+            if type(value) not in _PLAIN_TYPES and _is_dynamic(value):
+                if not is_mapping:
+                    plan.async_types.add(type(obj))
+                raise _AsyncSerializationRequired
+            if value is None:
+                value = field.default
+            if field.subschema is not None:
+                value = field.subschema._serialize_sync(value, field.subplan)
+            serialized[field_name] = value
+        return serialized
+
+    @classmethod
+    async def _serialize_async(cls, obj: Any, plan: 'SerializationPlan') -> Any:
+        is_mapping = is_mappable(obj)
+        if not is_mapping and is_iterable(obj):
+            return await cls._serialize_concurrently(obj, plan)
+        serialized = {}
+        for field in plan:
             field_value = await cls._getattr(
-                obj, field_name, default=field.default, is_mapping=is_mapping
+                obj, field.name, default=field.default, is_mapping=is_mapping
             )
-            if is_subschema(field.type_):
-                subschema: Type[Schema] = field.type_
-                subfields_config = (
-                    subschema.get_full_response_fields_config()
-                    if full
-                    else subschema.get_default_response_fields_config()
-                )
-                subattrs = {
-                    **subfields_config,
-                    **{
-                        subattr: set()
-                        for subattr in (subfields or [])
-                        if subattr in subschema.get_readable_fields()
-                    },
-                }
-                field_value = await subschema.serialize(
-                    field_value, fields=subattrs, jsonable=False
-                )
-            serialized[field_name] = field_value
-        return jsonable_encoder(serialized) if jsonable else serialized
+            if field.subschema is not None:
+                field_value = await field.subschema._serialize_planned(field_value, field.subplan)
+            serialized[field.name] = field_value
+        return serialized
+
+    @classmethod
+    async def _serialize_concurrently(cls, objects: Iterable, plan: 'SerializationPlan') -> List:
+        # Dynamic values of different objects (e.g. DB lookups) are awaited concurrently
+        concurrency = cls.__config__.serialize_concurrency
+        if concurrency <= 1:
+            return [await cls._serialize_planned(item, plan) for item in objects]
+        semaphore = Semaphore(concurrency)
+
+        async def serialize_item(item: Any) -> Any:
+            async with semaphore:
+                return await cls._serialize_planned(item, plan)
+
+        return list(await gather(*(serialize_item(item) for item in objects)))
+
+    @classmethod
+    def _get_serialization_plan(cls, fields: Optional[Mapping], full: bool) -> 'SerializationPlan':
+        if fields:
+            # Caller-supplied fields are resolved once per call rather than once per object
+            return cls._build_serialization_plan(fields, full)
+        plan = cls._full_serialization_plan if full else cls._default_serialization_plan
+        if plan is None:
+            plan = cls._build_serialization_plan(cls._get_fields_config(None, full), full)
+            if full:
+                cls._full_serialization_plan = plan
+            else:
+                cls._default_serialization_plan = plan
+        return plan
+
+    @classmethod
+    def _build_serialization_plan(cls, fields: Mapping, full: bool) -> 'SerializationPlan':
+        readable_fields = cls._readable_fields
+        return SerializationPlan(
+            _PlannedField(cls.__fields__[field_name], subfields, full)
+            for field_name, subfields in fields.items()
+            if field_name in readable_fields
+        )
+
+    @classmethod
+    def _get_fields_config(cls, fields: Optional[Mapping], full: bool) -> Mapping:
+        if fields:
+            return fields
+        if full:
+            return cls.get_full_response_fields_config()
+        return cls.get_default_response_fields_config()
+
+    @classmethod
+    def _get_subfields_config(cls, subfields: Optional[Iterable], full: bool) -> Mapping:
+        readable_fields = cls._readable_fields
+        return {
+            **cls._get_fields_config(None, full),
+            **{subattr: set() for subattr in (subfields or []) if subattr in readable_fields},
+        }
+
+    @classmethod
+    async def serialize_json(
+        cls,
+        obj: Any,
+        fields: Optional[Mapping] = None,
+        full: bool = False,
+        encoder: JSONEncoder = dumps_json,
+    ) -> bytes:
+        serialized = await cls.serialize(obj, fields, jsonable=False, full=full)
+        return encoder(serialized)
+
+    @classmethod
+    async def serialize_stream(
+        cls,
+        objects: Any,
+        fields: Optional[Mapping] = None,
+        full: bool = False,
+        encoder: JSONEncoder = dumps_json,
+    ) -> AsyncIterator[bytes]:
+        '''
+        Yields JSON array of serialized objects in chunks of STREAM_CHUNK_SIZE bytes or more,
+        so (async) iterables are never buffered as a whole.
+        '''
+        plan = cls._get_serialization_plan(fields, full)
+        chunk = bytearray(b'[')
+        separator = b''
+        async for obj in _iterate_async(objects):
+            chunk += separator
+            chunk += await cls._serialize_item_json(obj, plan, encoder)
+            separator = b','
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield bytes(chunk)
+                chunk = bytearray()
+        chunk += b']'
+        yield bytes(chunk)
+
+    @classmethod
+    async def _serialize_item_json(
+        cls, obj: Any, plan: 'SerializationPlan', encoder: JSONEncoder
+    ) -> bytes:
+        if type(obj) not in plan.async_types:
+            try:
+                return encoder(cls._serialize_sync(obj, plan))
+            except _AsyncSerializationRequired:
+                pass
+        return encoder(await cls._serialize_async(obj, plan))
 
     async def get_serialized(self, fields: Optional[Mapping] = None, jsonable: bool = True) -> Any:
         return await self.serialize(self, fields=fields, jsonable=jsonable)
@@ -171,6 +411,9 @@ class Schema(BaseModel):
             value = obj.get(name, None)
         else:
             value = getattr(obj, name, None)
+        if type(value) in _PLAIN_TYPES:
+            # Plain data values skip dynamic values checks
+            return default if value is None else value
         if callable(value):
             value = value()
         if is_awaitable(value):
@@ -181,7 +424,12 @@ class Schema(BaseModel):
 
 
 class ApiComponentName(str):
-    REGEX: Pattern = re.compile(r'[a-z_]+', flags=re.IGNORECASE)
+    REGEX: Pattern = re.compile(r'[a-z_]+', flags=re.IGNORECASE | re.ASCII)
+    _fullmatch: Callable = REGEX.fullmatch
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__()
+        cls._fullmatch = cls.REGEX.fullmatch
 
     @classmethod
     def __get_validators__(cls) -> Iterator[Callable]:
@@ -193,22 +441,126 @@ class ApiComponentName(str):
             raise TypeError('API component name must be a string')
         elif not value:
             raise ValueError('API component name must not be empty')
-        elif not cls.REGEX.fullmatch(value):
+        elif not cls._fullmatch(value):
             raise ValueError(
                 f'API component name "{value}" is invalid' f'(allowed pattern: {cls.REGEX.pattern})'
             )
         return cls(value.lower())
 
 
+class _AsyncSerializationRequired(Exception):
+    ...
+
+
+class _PlannedField:
+    '''
+    Readable field resolved for serialization with given fields config,
+    nested schema plan is built on first use (schemas may refer to each other).
+    '''
+
+    __slots__ = ('name', 'getter', 'default', 'subschema', '_subfields', '_full', '_subplan')
+
+    def __init__(self, field: ModelField, subfields: Optional[Iterable], full: bool):
+        self.name = field.name
+        self.getter = attrgetter(field.name)
+        self.default = field.default
+        self.subschema: Optional[Type[Schema]] = field.type_ if is_subschema(field.type_) else None
+        self._subfields = subfields
+        self._full = full
+        self._subplan: Optional[SerializationPlan] = None
+
+    @property
+    def subplan(self) -> 'SerializationPlan':
+        if self._subplan is None:
+            subschema: Type[Schema] = self.subschema  # type: ignore
+            if self._subfields:
+                subfields_config = subschema._get_subfields_config(self._subfields, self._full)
+                self._subplan = subschema._get_serialization_plan(subfields_config, full=False)
+            else:
+                self._subplan = subschema._get_serialization_plan(None, self._full)
+        return self._subplan
+
+
+class SerializationPlan(Tuple[_PlannedField, ...]):
+    '''
+    Planned fields with objects types inspected for dynamic values,
+    types found to have them are serialized asynchronously with this plan.
+    '''
+
+    names: Tuple[str, ...]
+    checked_types: Set[type]
+    async_types: Set[type]
+
+    def __new__(cls, fields: Iterable[_PlannedField]) -> 'SerializationPlan':
+        plan = super().__new__(cls, fields)
+        plan.names = tuple(field.name for field in plan)
+        plan.checked_types = set()
+        plan.async_types = set()
+        return plan
+
+
+async def _iterate_async(objects: Any) -> AsyncIterator[Any]:
+    if is_async_iterable(objects):
+        async for obj in objects:
+            yield obj
+    else:
+        for obj in objects:
+            yield obj
+
+
+_PLAIN_TYPES = frozenset((str, int, float, bool, type(None), dict, list, tuple))
+_JSON_NATIVE_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _is_dynamic(value: Any) -> bool:
+    return callable(value) or is_awaitable(value) or is_async_iterable(value)
+
+
+@lru_cache(maxsize=1024)
+def _has_dynamic_attributes(type_: type, names: Tuple[str, ...]) -> bool:
+    return any(_is_dynamic_attribute(type_, name) for name in names)
+
+
+def _is_dynamic_attribute(type_: type, name: str) -> bool:
+    attr = getattr_static(type_, name, None)
+    if isinstance(attr, property):
+        return iscoroutinefunction(attr.fget) or isasyncgenfunction(attr.fget)
+    return isfunction(attr) or isinstance(attr, (staticmethod, classmethod))
+
+
+def _is_json_native_type(type_: Any) -> bool:
+    return (
+        isinstance(type_, type)
+        and issubclass(type_, (str, int, float))
+        and not issubclass(type_, Enum)
+    )
+
+
+def _is_json_native(value: Any) -> bool:
+    value_type = type(value)
+    if value_type in _JSON_NATIVE_TYPES:
+        return True
+    elif value_type is list:
+        return all(_is_json_native(item) for item in value)
+    elif value_type is dict:
+        return all(type(key) is str and _is_json_native(item) for key, item in value.items())
+    return False
+
+
 def validate_schema(schema: Any) -> None:
     assert isinstance(schema, type), f'{schema} is not a class'
     assert issubclass(schema, Schema), f'{schema} is not subclassed from {Schema.__name__}'
 
 
 def is_subschema(type_: Any) -> bool:
-    return isinstance(type_, type) and issubclass(type_, Schema)
+    return isinstance(type_, type) and _is_schema_subclass(type_)
+
+
+@lru_cache(maxsize=512)
+def _is_schema_subclass(type_: type) -> bool:
+    return issubclass(type_, Schema)
 
 
 SchemaClass = Type[Schema]
-SchemaFields = Set[str]
-ResponseFieldsConfig = Dict[str, Set[str]]
+SchemaFields = AbstractSet[str]
+ResponseFieldsConfig = Dict[str, SchemaFields]
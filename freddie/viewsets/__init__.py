@@ -1,3 +1,8 @@
+import sys
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+from ..helpers import run_inline
 from .dependencies import Paginator
 from .generics import (
     CreateViewset,
@@ -21,7 +26,15 @@ from .mixins import (
 )
 from .route_decorator import route
 
-try:
+_DB_VIEWSETS_NAMES = (
+    'ListCreateModelViewSet',
+    'ModelViewSet',
+    'ReadOnlyModelViewSet',
+    'RetrieveUpdateModelDestroyViewSet',
+    'RetrieveUpdateModelViewSet',
+)
+
+if TYPE_CHECKING:  # pragma: no cover
     from .sql import (
         ListCreateModelViewSet,
         ModelViewSet,
@@ -29,16 +42,30 @@ try:
         RetrieveUpdateModelDestroyViewSet,
         RetrieveUpdateModelViewSet,
     )
-except ModuleNotFoundError:
 
-    class UnsupportedDBViewset(UnsupportedViewset):
-        error_message = 'database support not installed'
 
-    ListCreateModelViewSet = UnsupportedDBViewset  # type: ignore
-    ModelViewSet = UnsupportedDBViewset  # type: ignore
-    ReadOnlyModelViewSet = UnsupportedDBViewset  # type: ignore
-    RetrieveUpdateModelDestroyViewSet = UnsupportedDBViewset  # type: ignore
-    RetrieveUpdateModelViewSet = UnsupportedDBViewset  # type: ignore
+class UnsupportedDBViewset(UnsupportedViewset):
+    error_message = 'database support not installed'
+
+
+class _ViewsetsModule(ModuleType):
+    # Database viewsets are imported on first access only, as DB drivers take long to import
+    def __getattr__(self, name: str) -> Any:
+        if name not in _DB_VIEWSETS_NAMES:
+            raise AttributeError(f'module {self.__name__!r} has no attribute {name!r}')
+        try:
+            from . import sql
+        except ModuleNotFoundError:
+            viewsets = {viewset_name: UnsupportedDBViewset for viewset_name in _DB_VIEWSETS_NAMES}
+        else:
+            viewsets = {
+                viewset_name: getattr(sql, viewset_name) for viewset_name in _DB_VIEWSETS_NAMES
+            }
+        self.__dict__.update(viewsets)
+        return viewsets[name]
+
+
+sys.modules[__name__].__class__ = _ViewsetsModule
 
 __all__ = (
     'CreateViewset',
@@ -58,6 +85,7 @@ __all__ = (
     'UpdateViewset',
     'ViewSet',
     'route',
+    'run_inline',
     'ReadOnlyModelViewSet',
     'ListCreateModelViewSet',
     'RetrieveUpdateModelViewSet',
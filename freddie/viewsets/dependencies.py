@@ -1,6 +1,25 @@
-from collections import UserDict
-from re import compile as re_compile, sub as re_sub
-from typing import Any, Dict, Iterator, Match, Optional, Pattern, Tuple, Type, Union
+from collections.abc import Mapping
+from functools import lru_cache
+from inspect import Parameter, Signature
+from operator import attrgetter
+from re import compile as re_compile
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    ItemsView,
+    Iterator,
+    KeysView,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Type,
+    Union,
+    ValuesView,
+)
 
 from fastapi import Query
 from pydantic import BaseConfig
@@ -9,8 +28,13 @@ from pydantic.fields import ModelField
 
 from ..schemas import ResponseFieldsConfig, SchemaFields
 
+_KEYWORD = Parameter.POSITIONAL_OR_KEYWORD
+# Shared by all fields requested without subfields
+_NO_SUBFIELDS: FrozenSet[str] = frozenset()
+
 
 class Paginator:
+    __slots__ = ('limit', 'offset')
     limit: int
     offset: int
     default_limit: int = 50
@@ -31,10 +55,26 @@ class Paginator:
 
     def __init_subclass__(cls, **kwargs: Any):
         super().__init_subclass__()
-        cls._limit_query.default = cls.default_limit
-        cls._limit_query.le = cls.max_limit
-        cls._offset_query.default = cls.default_offset
-        cls._offset_query.le = cls.max_offset
+        # Queries are created anew for each subclass instead of mutating ones shared with base
+        cls._limit_query = Query(
+            default=cls.default_limit,
+            ge=1,
+            le=cls.max_limit,
+            description=cls._limit_query.description,
+        )
+        cls._offset_query = Query(
+            default=cls.default_offset,
+            ge=0,
+            le=cls.max_offset,
+            description=cls._offset_query.description,
+        )
+        # FastAPI reads dependency parameters from class signature
+        cls.__signature__ = Signature(  # type: ignore[attr-defined]
+            [
+                Parameter('limit', _KEYWORD, default=cls._limit_query, annotation=int),
+                Parameter('offset', _KEYWORD, default=cls._offset_query, annotation=int),
+            ]
+        )
 
     def __init__(
         self,
@@ -61,7 +101,9 @@ class ResponseFieldsQuery(str):
     )
 
 
-class ResponseFields(UserDict):
+class ResponseFields(Mapping):
+    # Read-only mapping with plain dict lookups
+    __slots__ = ('data',)
     data: 'ResponseFieldsConfig'
     allowed: SchemaFields = set()
     defaults: 'ResponseFieldsConfig' = {}
@@ -71,30 +113,72 @@ class ResponseFields(UserDict):
     REGEX: Pattern = re_compile(r'(?P<field>\w+)\((?P<subfields>[\w,]+)\)')
 
     def __init__(self, fields: ResponseFieldsQuery = ResponseFieldsQuery.param):
-        super().__init__()
         config = self.parse_query(fields) if fields else {}
         self.data = {
             **self.defaults,
             **{key: value for key, value in config.items() if key in self.allowed},
         }
 
-    @classmethod
-    def parse_query(cls, query_param: str) -> 'ResponseFieldsConfig':
-        subfields = {}
+    def __getitem__(self, key: str) -> AbstractSet[str]:
+        return self.data[key]
 
-        def get_subfields(matchobj: Match) -> str:
-            subfields[matchobj.group('field')] = set(matchobj.group('subfields').split(','))
-            return ''
+    def __contains__(self, key: Any) -> bool:
+        return key in self.data
 
-        query_param = re_sub(cls.REGEX, get_subfields, query_param)
-        rest: 'ResponseFieldsConfig' = {
-            field: set() for field in query_param.strip(',').split(',') if field
-        }
-        return {**rest, **subfields}
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return repr(self.data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def keys(self) -> KeysView:
+        return self.data.keys()
+
+    def values(self) -> ValuesView:
+        return self.data.values()
+
+    def items(self) -> ItemsView:
+        return self.data.items()
+
+    @classmethod
+    def parse_query(cls, query_param: str) -> 'ResponseFieldsConfig':
+        # Single pass over <field>,<field>(<subfield1>,<subfield2>,...),... string
+        fields: 'ResponseFieldsConfig' = {}
+        subfields: 'ResponseFieldsConfig' = {}
+        position = 0
+        length = len(query_param)
+        while position < length:
+            comma = query_param.find(',', position)
+            if comma == -1:
+                comma = length
+            paren = query_param.find('(', position, comma)
+            closing_paren = query_param.find(')', paren) if paren != -1 else -1
+            if closing_paren != -1:
+                field = query_param[position:paren]
+                if field:
+                    names = query_param[paren + 1 : closing_paren].split(',')
+                    subfields[field] = {name for name in names if name}
+                position = closing_paren + 1
+                if query_param.startswith(',', position):
+                    position += 1
+                continue
+            field = query_param[position:comma]
+            if field:
+                fields[field] = _NO_SUBFIELDS
+            position = comma + 1
+        return {**fields, **subfields}
 
     @classmethod
     def setup(cls, allowed: SchemaFields, defaults: ResponseFieldsConfig) -> Type['ResponseFields']:
-        return type(cls.__name__, (cls,), {'allowed': allowed, 'defaults': defaults})
+        return type(
+            cls.__name__, (cls,), {'__slots__': (), 'allowed': allowed, 'defaults': defaults}
+        )
 
 
 ResponseFieldsDict = Union[ResponseFields, dict]
@@ -102,6 +186,7 @@ ResponseFieldsDict = Union[ResponseFields, dict]
 
 class FilterBy:
     fields: Dict[str, ModelField]
+    _getters: Tuple[Tuple[str, Callable], ...] = ()
     PARAM_NAME: str = 'filter_by'
 
     class ModelConfig(BaseConfig):
@@ -111,15 +196,24 @@ class FilterBy:
     def setup(cls, dependency_class: Type) -> Type['FilterBy']:
         if dependency_class is cls:
             return cls  # pragma: no cover
-        data_cls = dataclass(dependency_class, config=cls.ModelConfig)
-        fields = data_cls.__pydantic_model__.__fields__
-        return type(cls.__name__, (cls, data_cls), {'fields': fields})
+        return _setup_filter_by(cls, dependency_class)
 
-    def items(self) -> Iterator[Tuple[str, Any]]:
-        for key in self.fields.keys():
-            value = getattr(self, key, None)
+    def items(self) -> List[Tuple[str, Any]]:
+        items = []
+        for key, getter in self._getters:
+            value = getter(self)
             if value is not None:
-                yield key, value
+                items.append((key, value))
+        return items
+
+
+@lru_cache(maxsize=None)
+def _setup_filter_by(cls: Type[FilterBy], dependency_class: Type) -> Type[FilterBy]:
+    # Same dependency class is shared by viewset instances, so it's set up only once
+    data_cls = dataclass(dependency_class, config=cls.ModelConfig)
+    fields = data_cls.__pydantic_model__.__fields__
+    getters = tuple((key, attrgetter(key)) for key in fields)
+    return type(cls.__name__, (cls, data_cls), {'fields': fields, '_getters': getters})
 
 
 FILTERABLE_VIEWSET_FLAG = '_IS_FILTERABLE'
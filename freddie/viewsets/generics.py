@@ -1,27 +1,70 @@
 import warnings
 from abc import ABC, ABCMeta, abstractmethod
+from functools import lru_cache
 from http import HTTPStatus
-from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
+from inspect import signature as get_signature
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 from uuid import UUID
 
 from fastapi import APIRouter, Body, Depends, Path, Response
 from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import ORJSONResponse
 from pydantic.fields import FieldInfo
 from starlette.requests import Request
-from starlette.responses import JSONResponse
-
-from ..helpers import extract_types, is_valid_type, patch_endpoint_signature, run_async_or_thread
-from ..schemas import ApiComponentName, Schema, SchemaClass, validate_schema
+from starlette.responses import JSONResponse, StreamingResponse
+
+from ..helpers import (
+    dumps_json,
+    dumps_orjson,
+    extract_types,
+    is_async_iterable,
+    is_iterable,
+    is_mappable,
+    is_valid_type,
+    patch_endpoint_signature,
+    run_async_or_thread,
+)
+from ..schemas import ApiComponentName, JSONEncoder, Schema, SchemaClass, validate_schema
 from .dependencies import ResponseFields, ResponseFieldsDict
 from .route_decorator import get_declared_routes
-from .signals import Signal, SignalDispatcher, get_signals_map
-
+from .signals import NullSignalDispatcher, Signal, SignalDispatcher, get_signals_map
+
+try:
+    import orjson  # noqa: F401
+except ModuleNotFoundError:
+    DEFAULT_RESPONSE_CLASS: Type[Response] = JSONResponse
+else:
+    DEFAULT_RESPONSE_CLASS = ORJSONResponse
+
+HTTP_200 = int(HTTPStatus.OK)
+HTTP_201 = int(HTTPStatus.CREATED)
+HTTP_204 = int(HTTPStatus.NO_CONTENT)
+HTTP_404 = int(HTTPStatus.NOT_FOUND)
 VALID_PK_TYPES = {int, str, UUID}
 DEFAULT_PK_TYPE = int
 DETAIL_ROUTE_PATTERN = '/{pk}'
 FIELDS_PARAM_NAME = ResponseFields.PARAM_NAME
+SIGNALS_PARAM_NAME = 'signals'
 
-_default_response_cls = Default(JSONResponse)
+_default_response_cls = Default(DEFAULT_RESPONSE_CLASS)
+# Response classes, which content is encoded right away without rendering,
+# with encoders producing the same output as classes do
+_JSON_ENCODERS: Dict[Type[Response], JSONEncoder] = {
+    JSONResponse: dumps_json,
+    ORJSONResponse: dumps_orjson,
+}
 
 
 class GenericViewSet(APIRouter, ABC):
@@ -29,14 +72,21 @@ class GenericViewSet(APIRouter, ABC):
     write_schema: Optional[SchemaClass] = None
     pk_type: Type = DEFAULT_PK_TYPE
     pk_parameter: FieldInfo
+    # Encode list responses in chunks while sending them; errors raised by objects
+    # beyond the first chunk can't turn into error responses then
+    stream_list_response: bool = False
 
     _component_name: str
     _component_name_plural: str
+    _component_title: str
+    _component_title_plural: str
+    _notfound_response: Optional['ResponsesDict']
     _pk_type_choices: Tuple[Type, ...]
     _openapi_tags: List[str]
     _response_fields_default_config: ResponseFieldsDict
     _response_fields_full_config: ResponseFieldsDict
     _signals_dispatcher_type: Type[SignalDispatcher]
+    _signals_default: Any
     validate_response: bool
     default_response_class: Type[Response]
 
@@ -55,22 +105,27 @@ class GenericViewSet(APIRouter, ABC):
         self.validate_schema()
         self.set_components_names()
         self.pk_type = pk_type or self.pk_type
-        self._pk_type_choices = tuple(_get_pk_type_choices(self.pk_type))
+        self._pk_type_choices = _get_pk_type_choices(self.pk_type)
         self.pk_parameter = pk_parameter or Path(
             ...,
-            title=f'{self._component_name.title()} lookup field',
+            title=f'{self._component_title} lookup field',
             description='Lookup value',
         )
         self._openapi_tags = self.get_openapi_tags()
         self._response_fields_default_config = self.schema.get_default_response_fields_config()
         self._response_fields_full_config = self.schema.get_full_response_fields_config()
         self._signals_dispatcher_type = SignalDispatcher.setup(get_signals_map(self))
+        self._signals_default = (
+            NullSignalDispatcher()
+            if self._signals_dispatcher_type is NullSignalDispatcher
+            else Depends()
+        )
         super().__init__(*args, **kwargs)
         self.validate_response = validate_response
         self.default_response_class = (
             self.default_response_class
             if not isinstance(self.default_response_class, DefaultPlaceholder)
-            else JSONResponse
+            else DEFAULT_RESPONSE_CLASS
         )
         self.add_routes_from_class_declaration()
         self.api_actions()
@@ -86,16 +141,35 @@ class GenericViewSet(APIRouter, ABC):
         self._component_name = ApiComponentName.validate(component_name)
         component_name_plural = schema_config.api_component_name_plural or f'{component_name}s'
         self._component_name_plural = ApiComponentName.validate(component_name_plural)
+        self._component_title = self._component_name.title()
+        self._component_title_plural = self._component_name_plural.title()
+        self._notfound_response = None
 
     def get_openapi_tags(self) -> List[str]:
-        return [self._component_name.title()]
+        return [self._component_title]
+
+    def patch_signals_parameter(self, endpoint: Callable) -> Callable:
+        # Without signal handlers, no-op dispatcher is passed by default instead of resolving it
+        if isinstance(self._signals_default, NullSignalDispatcher):
+            signature = get_signature(endpoint)
+            endpoint.__signature__ = signature.replace(  # type: ignore
+                parameters=[
+                    param
+                    for param in signature.parameters.values()
+                    if param.name != SIGNALS_PARAM_NAME
+                ]
+            )
+        return endpoint
 
     def notfound_response(self) -> 'ResponsesDict':
-        return {
-            int(HTTPStatus.NOT_FOUND): {
-                'description': f'{self._component_name.title()} instance not found',
+        # Same dict is shared by all detail routes, as FastAPI only reads it
+        if self._notfound_response is None:
+            self._notfound_response = {
+                HTTP_404: {
+                    'description': f'{self._component_title} instance not found',
+                }
             }
-        }
+        return self._notfound_response
 
     def add_routes_from_class_declaration(self) -> None:
         for route in get_declared_routes(self):
@@ -127,9 +201,37 @@ class GenericViewSet(APIRouter, ABC):
     ) -> Any:
         if isinstance(content, Response) or self.validate_response:
             return content
+        encoder = _JSON_ENCODERS.get(self.default_response_class)
+        if encoder is not None:
+            # Encode right away instead of walking serialized content again on rendering
+            content = await self.schema.serialize_json(content, fields, encoder=encoder)
+            return Response(content, status_code=status_code, media_type=JSONResponse.media_type)
         content = await self.schema.serialize(content, fields)
         return self.default_response_class(content=content, status_code=status_code)
 
+    async def list_response(
+        self, objects: Any, status_code: int = 200, fields: ResponseFieldsDict = None
+    ) -> Any:
+        streamable = is_async_iterable(objects) or (
+            is_iterable(objects) and not is_mappable(objects)
+        )
+        if (
+            not self.stream_list_response
+            or not streamable
+            or self.validate_response
+            or self.default_response_class not in _JSON_ENCODERS
+        ):
+            return await self.response(objects, status_code=status_code, fields=fields)
+        # First chunk is encoded before the response is started, so it still can fail
+        encoder = _JSON_ENCODERS[self.default_response_class]
+        chunks = self.schema.serialize_stream(objects, fields, encoder=encoder)
+        first_chunk = await chunks.__anext__()
+        return StreamingResponse(
+            _prepend_chunk(first_chunk, chunks),
+            status_code=status_code,
+            media_type=JSONResponse.media_type,
+        )
+
     async def perform_api_action(self, handler: Callable, *args: Any, **kwargs: Any) -> Any:
         return await run_async_or_thread(handler, *args, **kwargs)
 
@@ -146,11 +248,19 @@ class GenericViewSet(APIRouter, ABC):
         ...
 
 
-def _get_pk_type_choices(pk_type: Type) -> Iterable[Type]:
+async def _prepend_chunk(chunk: bytes, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    yield chunk
+    async for chunk in chunks:
+        yield chunk
+
+
+@lru_cache(maxsize=None)
+def _get_pk_type_choices(pk_type: Type) -> Tuple[Type, ...]:
+    # PK types are shared by viewset instances, so they're validated only once
     for type_ in extract_types(pk_type):
         if not is_valid_type(type_, VALID_PK_TYPES):
             raise TypeError(f'{type_} is not a valid ViewSet PK type. Allowed: {VALID_PK_TYPES}')
-        yield type_
+    return extract_types(pk_type)
 
 
 class DeprecationChecker(ABCMeta):
@@ -168,14 +278,14 @@ class ListViewset(GenericViewSet, metaclass=DeprecationChecker):
 
     def api_actions(self) -> None:
         super().api_actions()
-        status_code = int(HTTPStatus.OK)
+        status_code = HTTP_200
         response_model = getattr(self, 'list_schema', List[self.schema])  # type: ignore
         # todo remove it in next releases
         method = getattr(self, 'list', self.get_list)
 
         async def endpoint(*, request: Request, **params: Any) -> Any:
             objects = await self.perform_api_action(method, request=request, **params)
-            return await self.response(objects, fields=params.get(FIELDS_PARAM_NAME))
+            return await self.list_response(objects, fields=params.get(FIELDS_PARAM_NAME))
 
         self.add_api_route(
             '/',
@@ -184,7 +294,7 @@ class ListViewset(GenericViewSet, metaclass=DeprecationChecker):
             status_code=status_code,
             response_class=_default_response_cls if self.validate_response else Response,
             response_model=response_model if self.validate_response else None,
-            response_description=f'{self._component_name_plural.title()} listed',
+            response_description=f'{self._component_title_plural} listed',
             responses={status_code: {'model': response_model}},
             operation_id=f'list_{self._component_name_plural}',
             summary=f'List {self._component_name_plural}',
@@ -203,7 +313,7 @@ class RetrieveViewset(GenericViewSet):
         super().api_actions()
 
         pk_type = self.pk_type
-        status_code = int(HTTPStatus.OK)
+        status_code = HTTP_200
         response_model = getattr(self, 'detail_schema', self.schema)  # type: ignore
 
         async def endpoint(
@@ -222,7 +332,7 @@ class RetrieveViewset(GenericViewSet):
             status_code=status_code,
             response_class=_default_response_cls if self.validate_response else Response,
             response_model=response_model if self.validate_response else None,
-            response_description=f'{self._component_name.title()} instance retrieved',
+            response_description=f'{self._component_title} instance retrieved',
             responses={**self.notfound_response(), status_code: {'model': response_model}},
             operation_id=f'get_{self._component_name}',
             summary=f'Retrieve {self._component_name}',
@@ -238,15 +348,16 @@ class CreateViewset(GenericViewSet):
     def api_actions(self) -> None:
         super().api_actions()
 
-        status_code = int(HTTPStatus.CREATED)
+        status_code = HTTP_201
         request_body_type = self.write_schema or self.schema
         signals_dispatcher = self._signals_dispatcher_type
+        signals_default = self._signals_default
 
         async def endpoint(
             body: request_body_type = Body(...),  # type: ignore
             *,
             request: Request,
-            signals: signals_dispatcher = Depends(),  # type: ignore
+            signals: signals_dispatcher = signals_default,  # type: ignore
             **params: Any,
         ) -> Any:
             await self.validate_request_body(body)
@@ -256,12 +367,12 @@ class CreateViewset(GenericViewSet):
 
         self.add_api_route(
             '/',
-            patch_endpoint_signature(endpoint, self.create),
+            self.patch_signals_parameter(patch_endpoint_signature(endpoint, self.create)),
             methods=['POST'],
             status_code=status_code,
             response_class=_default_response_cls if self.validate_response else Response,
             response_model=self.schema if self.validate_response else None,
-            response_description=f'{self._component_name.title()} instance created',
+            response_description=f'{self._component_title} instance created',
             responses={status_code: {'model': self.schema}},
             operation_id=f'create_{self._component_name}',
             summary=f'Create {self._component_name}',
@@ -283,7 +394,8 @@ class UpdateViewset(GenericViewSet):
             f'{self.schema.__name__}UpdateRequest'
         )
         signals_dispatcher = self._signals_dispatcher_type
-        status_code = int(HTTPStatus.OK)
+        signals_default = self._signals_default
+        status_code = HTTP_200
         responses: 'ResponsesDict' = {
             **self.notfound_response(),
             status_code: {'model': self.schema},
@@ -295,7 +407,7 @@ class UpdateViewset(GenericViewSet):
             body: request_body_type = Body(...),  # type: ignore
             *,
             request: Request,
-            signals: signals_dispatcher = Depends(),  # type: ignore
+            signals: signals_dispatcher = signals_default,  # type: ignore
             **params: Any,
         ) -> Any:
             obj = await self.get_object_or_404(
@@ -316,7 +428,7 @@ class UpdateViewset(GenericViewSet):
             body: request_body_partial_type = Body(...),  # type: ignore
             *,
             request: Request,
-            signals: signals_dispatcher = Depends(),  # type: ignore
+            signals: signals_dispatcher = signals_default,  # type: ignore
         ) -> Any:
             obj = await self.get_object_or_404(
                 pk, request=request, fields=self._response_fields_full_config
@@ -333,12 +445,12 @@ class UpdateViewset(GenericViewSet):
 
         self.add_api_route(
             DETAIL_ROUTE_PATTERN,
-            patch_endpoint_signature(update_endpoint, self.update),
+            self.patch_signals_parameter(patch_endpoint_signature(update_endpoint, self.update)),
             methods=['PUT'],
             status_code=status_code,
             response_class=_default_response_cls if self.validate_response else Response,
             response_model=self.schema if self.validate_response else None,
-            response_description=f'{self._component_name.title()} instance fully updated',
+            response_description=f'{self._component_title} instance fully updated',
             responses=responses,
             operation_id=f'full_update_{self._component_name}',
             summary=f'Full update {self._component_name}',
@@ -346,12 +458,14 @@ class UpdateViewset(GenericViewSet):
         )
         self.add_api_route(
             DETAIL_ROUTE_PATTERN,
-            patch_endpoint_signature(update_partial_endpoint, self.update),
+            self.patch_signals_parameter(
+                patch_endpoint_signature(update_partial_endpoint, self.update)
+            ),
             methods=['PATCH'],
             status_code=status_code,
             response_class=_default_response_cls if self.validate_response else Response,
             response_model=self.schema if self.validate_response else None,
-            response_description=f'{self._component_name.title()} instance updated',
+            response_description=f'{self._component_title} instance updated',
             responses=responses,
             operation_id=f'update_{self._component_name}',
             summary=f'Update {self._component_name}',
@@ -369,13 +483,14 @@ class DestroyViewset(GenericViewSet):
 
         pk_type = self.pk_type
         signals_dispatcher = self._signals_dispatcher_type
-        status_code = int(HTTPStatus.NO_CONTENT)
+        signals_default = self._signals_default
+        status_code = HTTP_204
 
         async def endpoint(
             pk: pk_type = self.pk_parameter,  # type: ignore
             *,
             request: Request,
-            signals: signals_dispatcher = Depends(),  # type: ignore
+            signals: signals_dispatcher = signals_default,  # type: ignore
             **params: Any,
         ) -> Response:
             obj = await self.get_object_or_404(
@@ -383,14 +498,14 @@ class DestroyViewset(GenericViewSet):
             )
             await self.perform_api_action(self.destroy, pk, request=request, **params)
             signals.send(Signal.POST_DELETE, obj)  # type: ignore
-            return Response('', status_code=int(HTTPStatus.NO_CONTENT))
+            return Response('', status_code=HTTP_204)
 
         self.add_api_route(
             DETAIL_ROUTE_PATTERN,
-            patch_endpoint_signature(endpoint, self.destroy),
+            self.patch_signals_parameter(patch_endpoint_signature(endpoint, self.destroy)),
             methods=['DELETE'],
             status_code=status_code,
-            response_description=f'{self._component_name.title()} instance deleted',
+            response_description=f'{self._component_title} instance deleted',
             responses=self.notfound_response(),
             operation_id=f'delete_{self._component_name}',
             summary=f'Delete {self._component_name}',
@@ -48,8 +48,9 @@ class FilterableListViewset:
     Filter: Type = FilterBy
 
     def __init_subclass__(cls, **kwargs: Any):
-        super().__init_subclass__()
+        # Flag is set first, so viewset base classes can see it on subclass init
         setattr(cls, FILTERABLE_VIEWSET_FLAG, True)
+        super().__init_subclass__()
 
     def get_list_dependencies(self) -> PredefinedDependencies:
         filter_by = FilterBy.PARAM_NAME, FilterBy.setup(self.Filter)
@@ -1,6 +1,7 @@
-from inspect import getmembers
 from typing import TYPE_CHECKING, Any, Callable, Iterator
 
+from ..helpers import get_flagged_members_names
+
 if TYPE_CHECKING:
     from typing_extensions import Protocol
 
@@ -31,7 +32,5 @@ def route(detail: bool = False, path: str = None, name: str = None, **kwargs: An
 
 
 def get_declared_routes(obj: Any) -> Iterator[ViewSetRoute]:
-    for _, route_endpoint in getmembers(
-        obj, lambda member: callable(member) and hasattr(member, VIEWSET_ROUTE_FLAG)
-    ):
-        yield route_endpoint
+    for name in get_flagged_members_names(type(obj), VIEWSET_ROUTE_FLAG):
+        yield getattr(obj, name)
@@ -1,10 +1,11 @@
 from collections import defaultdict
 from enum import Enum, unique
-from inspect import getmembers
-from typing import TYPE_CHECKING, Any, Callable, DefaultDict, List, Tuple, Type
+from typing import TYPE_CHECKING, Any, Callable, DefaultDict, Dict, List, Tuple, Type
 
 from fastapi import BackgroundTasks
 
+from ..helpers import get_flagged_members_names
+
 
 @unique
 class Signal(str, Enum):
@@ -22,12 +23,11 @@ if TYPE_CHECKING:
         def __call__(self, *args: Any, **kwargs: Any) -> Any:
             ...
 
-
 else:
     SignalHandler = Callable
 
 
-SignalsMap = DefaultDict[Signal, List[SignalHandler]]
+SignalsMap = Dict[Signal, Tuple[SignalHandler, ...]]
 VIEWSET_SIGNAL_FLAG = 'is_viewset_signal'
 
 
@@ -41,17 +41,18 @@ def signal(signal_type: Signal) -> Callable:
 
 
 def get_signals_map(obj: Any) -> SignalsMap:
-    signals_map: SignalsMap = defaultdict(list)
-    handlers: List[Tuple[str, SignalHandler]] = getmembers(
-        obj, lambda member: callable(member) and hasattr(member, VIEWSET_SIGNAL_FLAG)
-    )
-    for _, handler in handlers:
-        signals_map[handler.type].append(handler)
-    return signals_map
+    handlers: DefaultDict[Signal, List[SignalHandler]] = defaultdict(list)
+    for name in get_flagged_members_names(type(obj), VIEWSET_SIGNAL_FLAG):
+        handler: SignalHandler = getattr(obj, name)
+        handlers[handler.type].append(handler)
+    return {
+        signal_type: tuple(signal_handlers) for signal_type, signal_handlers in handlers.items()
+    }
 
 
 class SignalDispatcher:
-    mapping: SignalsMap
+    __slots__ = ('bg_tasks',)
+    mapping: SignalsMap = {}
     bg_tasks: BackgroundTasks
 
     def __init__(self, bg_tasks: BackgroundTasks):
@@ -59,7 +60,9 @@ class SignalDispatcher:
 
     @classmethod
     def setup(cls, mapping: SignalsMap) -> Type['SignalDispatcher']:
-        return type(cls.__name__, (cls,), {'mapping': mapping})
+        if not mapping:
+            return NullSignalDispatcher
+        return type(cls.__name__, (cls,), {'__slots__': (), 'mapping': mapping})
 
     def send(
         self,
@@ -68,10 +71,27 @@ class SignalDispatcher:
         obj_before_update: Any = None,
         **kwargs: Any,
     ) -> None:
-        for handler in self.mapping[signal_type]:
+        for handler in self.mapping.get(signal_type, ()):
             self.bg_tasks.add_task(handler, obj, obj_before_update=obj_before_update, **kwargs)
 
 
+class NullSignalDispatcher(SignalDispatcher):
+    '''
+    Dispatcher for viewsets without signal handlers,
+    which doesn't require background tasks to be injected
+    '''
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        ...
+
+    def send(
+        self, signal_type: Signal, obj: Any, obj_before_update: Any = None, **kwargs: Any
+    ) -> None:
+        ...
+
+
 post_save = Signal.POST_SAVE
 pre_delete = Signal.PRE_DELETE
 post_delete = Signal.POST_DELETE
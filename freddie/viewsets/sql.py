@@ -1,8 +1,11 @@
+from functools import lru_cache
 from typing import (
+    AbstractSet,
     Any,
     AsyncIterable,
     Callable,
     Dict,
+    FrozenSet,
     Iterable,
     Iterator,
     Optional,
@@ -29,13 +32,17 @@ from ..db.queries import (
     Function,
     Prefetch,
     Query,
+    add_related,
     get_related,
+    is_subquery_prefetchable,
+    iter_objects,
     prefetch_related,
+    related_ids_subquery,
     set_related,
 )
 from ..exceptions import NotFound, ServerError, Unprocessable, db_errors_handler
 from ..helpers import init_sql_logger, is_iterable
-from ..schemas import Schema
+from ..schemas import Schema, is_subschema
 from .dependencies import FILTERABLE_VIEWSET_FLAG, FilterBy, Paginator, ResponseFieldsDict
 from .generics import (
     FIELDS_PARAM_NAME,
@@ -53,6 +60,9 @@ ModelPK = Any
 ModelData = Dict[str, Any]
 ModelRelations = Iterable[Tuple[ManyToManyField, set]]
 ExtraFields = Dict[str, Union[DBField, Function]]
+SelectPlan = Tuple[Tuple[Any, ...], Tuple[Type[Model], ...]]
+SELECT_PLANS_CACHE_SIZE = 256
+BodyKeyTarget = Union[str, ManyToManyField, None]
 
 
 class GenericModelViewSet(GenericViewSet):
@@ -62,9 +72,25 @@ class GenericModelViewSet(GenericViewSet):
     model_ordering: Tuple[Union[DBField, Ordering], ...] = ()
     _model_fields: FieldsMap
     _model_props_dependencies: PropsDependenciesMap
+    _model_props_fk_dependencies: Dict[str, Tuple[ForeignKeyField, ...]]
+    _select_plans: Dict[FrozenSet[str], SelectPlan]
+    _prefetch_configs: Dict[FrozenSet[str], Tuple[Prefetch, ...]]
+    _base_queries: Dict[FrozenSet[str], Query]
+    _body_keys_targets: Dict[str, BodyKeyTarget]
+    _body_excluded_keys: AbstractSet[str]
     _is_filterable_by_query_params: bool = False
+    _is_prefetch_config_cacheable: bool = True
     _VALIDATE_SCHEMA_CONSTR: bool = False
 
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        # Filterable mixin flags subclasses, so it's checked once per class
+        cls._is_filterable_by_query_params = hasattr(cls, FILTERABLE_VIEWSET_FLAG)
+        # Overridden prefetch config may depend on subfields too, so it's never cached
+        cls._is_prefetch_config_cacheable = (
+            cls.build_prefetch_config is GenericModelViewSet.build_prefetch_config
+        )
+
     def __init__(
         self,
         *args: Any,
@@ -82,9 +108,23 @@ class GenericModelViewSet(GenericViewSet):
         if self._VALIDATE_SCHEMA_CONSTR:
             self.validate_schema_constraints()
         self._model_props_dependencies = self.model.map_props_dependencies()
+        self._model_props_fk_dependencies = {
+            prop: tuple(field for field in fields if isinstance(field, ForeignKeyField))
+            for prop, fields in self._model_props_dependencies.items()
+        }
+        self._select_plans = {}
+        self._prefetch_configs = {}
+        self._base_queries = {
+            frozenset(fields): self.build_query(fields)
+            for fields in (self._response_fields_default_config, self._response_fields_full_config)
+        }
+        self._body_excluded_keys = self.schema.get_read_only_fields() | {self.pk_field.name}
+        self._body_keys_targets = {
+            field.alias: self.get_body_key_target(field.alias)
+            for field in self.schema.__fields__.values()
+        }
         if self.validate_response:
             self.schema.__config__.orm_mode = True
-        self._is_filterable_by_query_params = hasattr(self, FILTERABLE_VIEWSET_FLAG)
         if sql_debug:
             init_sql_logger()
 
@@ -107,76 +147,132 @@ class GenericModelViewSet(GenericViewSet):
         return model
 
     def validate_schema_constraints(self) -> None:
-        writable_schema_fields = self.schema.get_writable_fields()
-        for field_name, db_field in self.model.fields().items():
-            if isinstance(db_field, CharField) and field_name in writable_schema_fields:
-                schema_max_length = self.schema.get_field_max_length(field_name)
-                if not schema_max_length or schema_max_length > db_field.max_length:
-                    raise AssertionError(
-                        f'{self.schema.__name__}.{field_name} '
-                        f'maxlength not set or greater than DB field maxlength'
-                    )
+        _validate_schema_constraints(self.model, self.schema)
 
     def lookup_expr(self, pk: Any) -> Expression:
-        if self.secondary_lookup_field is not None and type(pk) != self._pk_type_choices[0]:
+        if self.is_secondary_lookup(pk):
             return self.secondary_lookup_field == pk
         return self.pk_field == pk
 
+    def is_secondary_lookup(self, pk: Any) -> bool:
+        return self.secondary_lookup_field is not None and type(pk) != self._pk_type_choices[0]
+
     def apply_query_filters(self, query: Query, **params: Any) -> Query:
-        if self._is_filterable_by_query_params:
-            filter_params = params.get(FilterBy.PARAM_NAME, {})
-            for field_name, filter_value in filter_params.items():
-                model_field = self._model_fields.get(field_name)
-                if model_field:
-                    query = query.where(model_field == filter_value)
+        filter_params = (
+            params.get(FilterBy.PARAM_NAME) if self._is_filterable_by_query_params else None
+        )
+        if not filter_params:
+            return query
+        model_fields = self._model_fields
+        for field_name, filter_value in filter_params.items():
+            model_field = model_fields.get(field_name)
+            if model_field is not None:
+                query = query.where(model_field == filter_value)
         return query
 
     def construct_query(
         self, request: Request, fields: ResponseFieldsDict = None, extra: ExtraFields = None
     ) -> Query:
         fields = fields if fields is not None else self._response_fields_default_config
+        if extra:
+            return self.build_query(fields, extra)
+        # Queries without extra fields are reused per fields set,
+        # default and full fields sets ones are prebuilt on init
+        fields_key = frozenset(fields)
+        base_query = self._base_queries.get(fields_key)
+        if base_query is None:
+            base_query = self.build_query(fields_key)
+            if len(self._base_queries) < SELECT_PLANS_CACHE_SIZE:
+                self._base_queries[fields_key] = base_query
+        return _clone_query(base_query)
+
+    def build_query(self, fields: Iterable[str], extra: ExtraFields = None) -> Query:
+        selected, joined = self.get_select_plan(fields)
+        extra_selected = [
+            field.alias(alias)
+            for alias, field in (extra or {}).items()
+            if isinstance(field, (DBField, Function))
+        ]
+        query = self.model.select(*([*selected, *extra_selected] or (self.pk_field,)))
+        if self.model_ordering:
+            query = query.order_by(*self.model_ordering)
+        for joined_model in joined:
+            query = query.join_from(self.model, joined_model, JOIN.LEFT_OUTER)
+        return query
+
+    def get_select_plan(self, fields: Iterable[str]) -> SelectPlan:
+        # Requests usually share few response fields sets, so selected columns and joins are reused
+        fields_key = frozenset(fields)
+        plan = self._select_plans.get(fields_key)
+        if plan is None:
+            plan = self.build_select_plan(fields_key)
+            if len(self._select_plans) < SELECT_PLANS_CACHE_SIZE:
+                self._select_plans[fields_key] = plan
+        return plan
+
+    def build_select_plan(self, fields: Iterable[str]) -> SelectPlan:
         selected = set()
         joined = set()
-        model_fields = {field_name: self._model_fields.get(field_name) for field_name in fields}
-        for field_name, db_field in model_fields.items():
+        model_fields = self._model_fields
+        for field_name in fields:
+            db_field = model_fields.get(field_name)
             # Foreign key ID
             if db_field is None and field_name.endswith(FK_FIELD_POSTFIX):
-                fk_field = self._model_fields.get(field_name[: -len(FK_FIELD_POSTFIX)])
+                fk_field = model_fields.get(field_name[: -len(FK_FIELD_POSTFIX)])
                 if fk_field:
                     selected.add(fk_field)
 
             # Model property/getter method decorated with @depends_on
             elif db_field is None:
-                dependencies: Iterable[DBField] = self._model_props_dependencies.get(field_name, [])
-                for required_field in dependencies:
-                    selected.add(required_field)
-                fk_dependencies: Iterator[ForeignKeyField] = filter(
-                    lambda f: isinstance(f, ForeignKeyField), dependencies
-                )
-                for fk in fk_dependencies:
+                selected.update(self._model_props_dependencies.get(field_name, ()))
+                for fk in self._model_props_fk_dependencies.get(field_name, ()):
                     joined.add(fk.rel_model)
                     selected.add(fk.rel_model)
 
             # Add related models
-            # TODO: select only necessary related model fields
             elif isinstance(db_field, ForeignKeyField):
                 joined.add(db_field.rel_model)
-                selected.add(db_field.rel_model)
+                selected.update(self.get_related_columns(field_name, db_field))
 
             # Just normal DB column to select
             else:
                 selected.add(db_field)
 
-        for alias, field in (extra or {}).items():
-            if isinstance(field, (DBField, Function)):
-                selected.add(field.alias(alias))
-
-        query = self.model.select(*(selected or (self.pk_field,)))
-        if self.model_ordering:
-            query = query.order_by(*self.model_ordering)
-        for joined_model in joined:
-            query = query.join_from(self.model, joined_model, JOIN.LEFT_OUTER)
-        return query
+        return tuple(selected), tuple(joined)
+
+    def get_related_columns(self, field_name: str, fk_field: ForeignKeyField) -> Tuple[Any, ...]:
+        # Select only related model columns readable by nested schema
+        rel_model = fk_field.rel_model
+        schema_field = self.schema.__fields__.get(field_name)
+        if schema_field is None or not issubclass(rel_model, Model):
+            return (rel_model,)
+        nested_schema = schema_field.type_
+        if not is_subschema(nested_schema):
+            return (rel_model,)
+        rel_fields = rel_model.fields()
+        rel_props_dependencies = rel_model.map_props_dependencies()
+        columns = {rel_model.pk_field(), fk_field.rel_field}
+        for name in nested_schema.get_readable_fields():
+            if name in rel_fields:
+                columns.add(rel_fields[name])
+            elif name in rel_props_dependencies:
+                columns.update(rel_props_dependencies[name])
+            elif name not in rel_model.manytomany:
+                # Attribute dependencies are unknown, so every column may be required
+                return (rel_model,)
+        return tuple(columns)
+
+    def get_prefetch_config(self, fields: ResponseFieldsDict) -> Tuple[Prefetch, ...]:
+        if not self._is_prefetch_config_cacheable:
+            return tuple(self.build_prefetch_config(fields))
+        # Default config depends on top-level fields names only
+        fields_key = frozenset(fields)
+        config = self._prefetch_configs.get(fields_key)
+        if config is None:
+            config = tuple(self.build_prefetch_config(fields))
+            if len(self._prefetch_configs) < SELECT_PLANS_CACHE_SIZE:
+                self._prefetch_configs[fields_key] = config
+        return config
 
     def build_prefetch_config(self, fields: ResponseFieldsDict) -> Iterator[Prefetch]:
         for field_name in fields:
@@ -200,9 +296,10 @@ class GenericModelViewSet(GenericViewSet):
         try:
             obj = await self.model.manager.get(query)
         except self.model.DoesNotExist:
-            raise NotFound(f'{self._component_name.title()} not found')
-        related_config = list(self.build_prefetch_config(fields or {}))
+            raise NotFound(f'{self._component_title} not found')
+        related_config = self.get_prefetch_config(fields or {})
         if related_config:
+            # Relations are looked up by the found object's PK, whatever the lookup field is
             related = await get_related(obj.pk, related_config)
             for attr_name, items in related.items():
                 setattr(obj, attr_name, items)
@@ -213,30 +310,42 @@ class GenericModelViewSet(GenericViewSet):
     ) -> Tuple[ModelData, ModelRelations]:
         data = {}
         related = []
-        excluded_keys = self.schema.get_read_only_fields() | {self.pk_field.name}
         serialized = body.dict(
-            exclude=excluded_keys,
+            exclude=self._body_excluded_keys,
             exclude_unset=not on_create,
             exclude_none=True,
             by_alias=True,
         )
+        body_keys_targets = self._body_keys_targets
         for key, value in serialized.items():
-            if key not in self._model_fields:
-                # Handle one-to-many relations
-                if key.endswith(FK_FIELD_POSTFIX):
-                    field_name = key[: -len(FK_FIELD_POSTFIX)]
-                    if field_name in self._model_fields:
-                        data[field_name] = value
-                # Handle many-to-many relations
-                elif key.endswith(M2M_FIELD_POSTFIX) and is_iterable(value):
-                    field_name = key[: -len(M2M_FIELD_POSTFIX)]
-                    field = self.model.manytomany.get(field_name)
-                    if field is not None:
-                        related.append((field, set(value)))
+            target = (
+                body_keys_targets[key]
+                if key in body_keys_targets
+                else self.get_body_key_target(key)
+            )
+            if target is None:
                 continue
-            data[key] = value
+            elif isinstance(target, ManyToManyField):
+                if is_iterable(value):
+                    related.append((target, set(value)))
+            else:
+                data[target] = value
         return data, related
 
+    def get_body_key_target(self, key: str) -> BodyKeyTarget:
+        # Model column name or many-to-many field to save request body value to
+        if key in self._model_fields:
+            return key
+        # Handle one-to-many relations
+        elif key.endswith(FK_FIELD_POSTFIX):
+            field_name = key[: -len(FK_FIELD_POSTFIX)]
+            if field_name in self._model_fields:
+                return field_name
+        # Handle many-to-many relations
+        elif key.endswith(M2M_FIELD_POSTFIX):
+            return self.model.manytomany.get(key[: -len(M2M_FIELD_POSTFIX)])
+        return None
+
 
 class ModelRetrieveViewset(GenericModelViewSet, RetrieveViewset):
     async def retrieve(self, pk: Any, *, request: Request, **params: Any) -> Model:
@@ -253,12 +362,26 @@ class ModelListViewset(GenericModelViewSet, ListViewset):
     ) -> Union[Iterable[Model], AsyncIterable[Model]]:
         fields = params.get(FIELDS_PARAM_NAME) or self._response_fields_default_config
         query = self.construct_query(request, fields)
+        prefetched_config = self.get_prefetch_config(fields)
+        if prefetched_config:
+            # Related IDs are selected as arrays along with objects, no extra query needed
+            subqueries = [
+                related_ids_subquery(prefetch.field).alias(prefetch.attr_name)
+                for prefetch in prefetched_config
+                if is_subquery_prefetchable(prefetch)
+            ]
+            if subqueries:
+                query = query.select_extend(*subqueries)
+                prefetched_config = tuple(
+                    prefetch
+                    for prefetch in prefetched_config
+                    if not is_subquery_prefetchable(prefetch)
+                )
         query = self.apply_dependencies_params(query, **params)
-        objects = await self.model.manager.execute(query)
-        prefetched_config = list(self.build_prefetch_config(fields))
+        objects = iter_objects(await self.model.manager.execute(query))
         if prefetched_config:
             return prefetch_related(objects, prefetched_config)
-        return (obj for obj in objects)
+        return objects
 
     def apply_dependencies_params(self, query: Query, **params: Any) -> Query:
         filter_by: Optional[FilterBy] = params.get(FilterBy.PARAM_NAME)
@@ -297,12 +420,12 @@ class ModelCreateViewset(GenericModelViewSet, CreateViewset):
         with db_errors_handler():
             pk = await self.perform_create(data, request=request, **params)
         if not pk:
-            raise ServerError(f'{self._component_name.title()} not created')  # pragma: no cover
+            raise ServerError(f'{self._component_title} not created')  # pragma: no cover
         with db_errors_handler():
+            # Sequentially, so writes stay in the caller's task-bound transaction
             for field, ids in related:
-                if not ids:
-                    continue
-                await set_related(pk, field, ids)
+                if ids:
+                    await add_related(pk, field, ids)
         return pk
 
     async def perform_create(self, data: ModelData, **params: Any) -> Any:
@@ -331,7 +454,7 @@ class ModelUpdateViewset(GenericModelViewSet, UpdateViewset):
             with db_errors_handler():
                 updated = await self.perform_update(pk, data, request=request, **params)
             if not updated:
-                raise ServerError(f'{self._component_name.title()} not updated')  # pragma: no cover
+                raise ServerError(f'{self._component_title} not updated')  # pragma: no cover
         with db_errors_handler():
             for field, ids in related:
                 await set_related(pk, field, ids)
@@ -347,7 +470,7 @@ class ModelDestroyViewset(GenericModelViewSet, DestroyViewset):
     async def destroy(self, pk: ModelPK, *, request: Request, **params: Any) -> None:
         deleted = await self.perform_destroy(pk, request=request, **params)
         if not deleted:
-            raise ServerError(f'{self._component_name.title()} not deleted')  # pragma: no cover
+            raise ServerError(f'{self._component_title} not deleted')  # pragma: no cover
 
     async def perform_destroy(self, pk: ModelPK, **params: Any) -> Any:
         query = self.model.delete()
@@ -381,3 +504,24 @@ class ModelViewSet(
     ModelDestroyViewset,
 ):
     ...
+
+
+@lru_cache(maxsize=None)
+def _validate_schema_constraints(model: Type[Model], schema: Type[Schema]) -> None:
+    # Same model & schema pair is shared by viewset instances, so it's validated only once
+    writable_schema_fields = schema.get_writable_fields()
+    for field_name, db_field in model.fields().items():
+        if isinstance(db_field, CharField) and field_name in writable_schema_fields:
+            schema_max_length = schema.get_field_max_length(field_name)
+            if not schema_max_length or schema_max_length > db_field.max_length:
+                raise AssertionError(
+                    f'{schema.__name__}.{field_name} '
+                    f'maxlength not set or greater than DB field maxlength'
+                )
+
+
+def _clone_query(query: Query) -> Query:
+    # Peewee shares joins lists between clones, so further joins would modify cached query
+    clone = query.clone()
+    clone._joins = {source: list(joins) for source, joins in clone._joins.items()}
+    return clone
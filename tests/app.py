@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import lru_cache
 from typing import List, Union
 
 from fastapi import FastAPI, Request
@@ -64,16 +65,12 @@ class Item(Schema):
     metadata: dict = {'foo': 'bar'}
 
     def update(self, body: Schema) -> 'Item':
-        updated = self.copy()
-        for key, value in body.dict(exclude_unset=True).items():
-            setattr(updated, key, value)
-        return updated
+        return self.copy(update=body.dict(exclude_unset=True))
 
     @classmethod
+    @lru_cache(maxsize=128)
     def paginate(cls, limit: int, offset: int = 0):
-        for i in range(1, limit + 1):
-            item_id = i + offset
-            yield cls(id=item_id, title='Freddie')
+        return tuple(cls(id=i + offset, title='Freddie') for i in range(1, limit + 1))
 
 
 class EnvelopedItemResponse(BaseModel):
@@ -142,6 +139,23 @@ class TestViewSetSync(TestViewSet):
         pass
 
 
+class TestViewSetStreamed(TestViewSet):
+    stream_list_response = True
+
+
+class GoneItem:
+    id = 0
+
+    @property
+    def title(self):
+        raise NotFound('gone')
+
+
+class TestViewSetStreamedGone(TestViewSetStreamed):
+    async def get_list(self, *, request: Request, **params) -> List[Item]:
+        return [GoneItem()]
+
+
 class Paginated(PaginatedListViewset, ListViewset):
     schema = Item
 
@@ -290,6 +304,10 @@ class Log(BaseDBModel):
     state_before = JSONField(default=dict, null=True)
     state_after = JSONField(default=dict, null=True)
 
+    class Meta:
+        # Log entries are looked up by object and action
+        indexes = ((('obj_id', 'action_type'), False),)
+
     class ActionType(Enum):
         CREATE = 'create'
         UPDATE = 'update'
@@ -344,6 +362,8 @@ app = FastAPI(title='🕺 Freddie')
 app.include_router(TestViewSet(), prefix='/unvalidated')
 app.include_router(TestViewSet(validate_response=True), prefix='/validated')
 app.include_router(TestViewSetSync(), prefix='/sync')
+app.include_router(TestViewSetStreamed(), prefix='/streamed')
+app.include_router(TestViewSetStreamedGone(), prefix='/streamed-gone')
 app.include_router(Paginated(), prefix='/paginated')
 app.include_router(Fielded(), prefix='/fielded')
 app.include_router(TestDatabaseViewSet(sql_debug=settings.sql_debug), prefix='/post')
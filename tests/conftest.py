@@ -1,4 +1,5 @@
 from asyncio import get_event_loop
+from os import environ
 
 from async_asgi_testclient import TestClient
 from pytest import fixture
@@ -27,7 +28,9 @@ def client():
 
 @fixture(autouse=True, scope='session')
 def test_db():
-    db_name = f'{settings.postgres_db}_test'
+    # Each pytest-xdist worker gets its own database
+    worker_id = environ.get('PYTEST_XDIST_WORKER')
+    db_name = f'{settings.postgres_db}_test' + (f'_{worker_id}' if worker_id else '')
     run_sql(f'DROP DATABASE IF EXISTS {db_name}')
     run_sql(f'CREATE DATABASE {db_name}')
     db = Database(
@@ -42,6 +45,7 @@ def test_db():
     db.connect()
     for model in MODELS:
         model.manager.database = db
+    db.create_tables(MODELS)
 
     yield db
 
@@ -53,6 +57,7 @@ def test_db():
 
 @fixture(autouse=True)
 def transaction(test_db):
-    test_db.create_tables(MODELS)
     yield
-    test_db.drop_tables(MODELS)
+    # Tables are created once per session and only emptied between tests
+    tables = ', '.join(f'"{model._meta.table_name}"' for model in MODELS)
+    test_db.execute_sql(f'TRUNCATE {tables} RESTART IDENTITY CASCADE')
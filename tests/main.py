@@ -18,14 +18,18 @@ def create_db():
     run_sql(f'CREATE DATABASE {db_name}')
     with db.allow_sync():
         db.create_tables(BaseDBModel.__subclasses__())
-        AuthorFactory.create_batch(size=10)
-        TagFactory.create_batch(size=10)
-        PostFactory.create_batch(size=10)
+        with db.atomic():
+            AuthorFactory.create_batch(size=10)
+            TagFactory.create_batch(size=10)
+            PostFactory.create_batch(size=10)
 
 
 @cli.command()
-def run():
-    uvicorn.run(app, port=settings.app_port, access_log=False, use_colors=True)
+@click.option('--workers', default=1, show_default=True, help='Number of worker processes')
+def run(workers):
+    # Worker processes import the app by themselves
+    target = 'tests.app:app' if workers > 1 else app
+    uvicorn.run(target, port=settings.app_port, workers=workers, access_log=False, use_colors=True)
 
 
 if __name__ == '__main__':
@@ -1,6 +1,9 @@
+from collections.abc import Mapping
+from inspect import signature
+
 import pytest
 
-from freddie.viewsets.dependencies import FilterBy
+from freddie.viewsets.dependencies import FilterBy, Paginator, ResponseFields
 
 
 @pytest.fixture
@@ -22,3 +25,56 @@ def test_filter_by_attributes_exists(first_filter, second_filter):
     assert first_filter is not second_filter
     for expected_fields, filter_class in (first_filter, second_filter):
         assert expected_fields == set(filter_class.fields)
+
+
+def test_filter_by_setup_reused():
+    class Filter:
+        slug: str = None
+
+    assert FilterBy.setup(Filter) is FilterBy.setup(Filter)
+
+
+def test_filter_by_items(second_filter):
+    _, filter_class = second_filter
+    assert filter_class(title='Title').items() == [('title', 'Title')]
+
+
+@pytest.mark.parametrize(
+    'query,expected',
+    [
+        ('id', {'id': set()}),
+        ('id,title,', {'id': set(), 'title': set()}),
+        ('author(nickname,id)', {'author': {'nickname', 'id'}}),
+        ('id,author(nickname),tags(slug)', {'id': set(), 'author': {'nickname'}, 'tags': {'slug'}}),
+        ('author(id)title', {'author': {'id'}, 'title': set()}),
+        ('tags(),author(,id,)', {'tags': set(), 'author': {'id'}}),
+        ('', {}),
+    ],
+    ids=['single', 'plain', 'subfields', 'mixed', 'no_separator', 'empty_subfields', 'empty'],
+)
+def test_response_fields_query_parsing(query, expected):
+    assert ResponseFields.parse_query(query) == expected
+
+
+def test_response_fields_mapping():
+    fields_class = ResponseFields.setup(allowed={'id', 'author'}, defaults={'id': set()})
+    fields = fields_class(fields='author(id),secret')
+    assert fields == {'id': set(), 'author': {'id'}}
+    assert 'author' in fields and 'secret' not in fields
+    assert dict(fields.items()) == {**fields} == dict(fields) == fields.data
+    assert isinstance(fields, Mapping) and len(fields) == 2
+    assert not hasattr(fields, '__dict__')
+    with pytest.raises(TypeError):
+        fields['secret'] = set()
+
+
+def test_paginator_subclass_queries():
+    class CustomPaginator(Paginator):
+        default_limit = 10
+        max_limit = 20
+
+    parameters = signature(CustomPaginator).parameters
+    assert parameters['limit'].default.default == 10
+    assert parameters['limit'].default.le == 20
+    assert Paginator._limit_query.default == Paginator.default_limit
+    assert Paginator._limit_query.le == Paginator.max_limit
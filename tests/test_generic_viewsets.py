@@ -1,11 +1,20 @@
+from gc import collect as gc_collect
 from typing import Union
 from uuid import UUID
+from weakref import ref as weak_ref
 
 from pydantic import BaseModel, create_model
 from pytest import deprecated_call, mark, raises
 
 from freddie.schemas import Schema
-from freddie.viewsets.generics import GenericViewSet, ListViewset
+from freddie.viewsets.generics import DestroyViewset, GenericViewSet, ListViewset
+from freddie.viewsets.signals import (
+    NullSignalDispatcher,
+    Signal,
+    SignalDispatcher,
+    post_delete,
+    signal,
+)
 
 from .utils import create_schema_from_config
 
@@ -90,3 +99,46 @@ class TestViewSetInit:
     def test_invalid_pk_types(self, pk_type):
         with raises(TypeError):
             ViewSet(pk_type=pk_type)
+
+
+def test_db_viewsets_lazy_import():
+    import freddie.viewsets
+    from freddie.viewsets import sql
+
+    assert freddie.viewsets.ModelViewSet is sql.ModelViewSet
+    with raises(AttributeError):
+        freddie.viewsets.UnknownViewSet
+
+
+def test_signal_dispatcher_setup():
+    assert SignalDispatcher.setup({}) is NullSignalDispatcher
+    mapping = {Signal.POST_SAVE: (print,)}
+    dispatcher_type = SignalDispatcher.setup(mapping)
+    assert dispatcher_type.mapping is mapping
+    assert not hasattr(dispatcher_type(bg_tasks=None), '__dict__')
+
+
+@mark.parametrize('with_signals', [True, False], ids=['with_signals', 'without_signals'])
+def test_signals_parameter(with_signals):
+    class Destroy(DestroyViewset):
+        async def destroy(self, pk, *, request, **params):
+            ...
+
+    if with_signals:
+        Destroy.on_delete = signal(post_delete)(lambda self, obj, **params: None)
+
+    viewset = Destroy(schema=create_model('Item', __base__=Schema))
+    dependencies = viewset.routes[0].dependant.dependencies
+    assert any(dependency.name == 'signals' for dependency in dependencies) == with_signals
+
+
+def test_viewset_instances_released():
+    class Destroy(DestroyViewset):
+        async def destroy(self, pk, *, request, **params):
+            ...
+
+    viewset = Destroy(schema=create_model('Item', __base__=Schema))
+    viewset_ref = weak_ref(viewset)
+    del viewset
+    gc_collect()
+    assert viewset_ref() is None
@@ -1,6 +1,22 @@
+import json
+from datetime import datetime, time, timedelta, timezone
+from decimal import Decimal
+from threading import get_ident
+from uuid import uuid4
+
 import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from starlette.responses import JSONResponse
 
-from freddie.helpers import is_iterable
+from freddie.helpers import (
+    dumps_json,
+    dumps_orjson,
+    get_flagged_members_names,
+    is_iterable,
+    run_async_or_thread,
+    run_inline,
+)
 
 
 def gen():
@@ -13,11 +29,105 @@ def gen():
         (['foo', 'bar', 42], True),
         ({'foo', 'bar', 42}, True),
         ({'foo': 'bar'}, True),
+        (('foo', 'bar'), True),
+        (frozenset({'foo'}), True),
         ((_ for _ in range(3)), True),
         (gen(), True),
         ('string', False),
         ('bytes'.encode(), False),
+        (42, False),
+        (None, False),
     ],
 )
 def test_is_iterable(value, result):
     assert is_iterable(value) == result
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('inline', [True, False], ids=['inline', 'threadpool'])
+async def test_run_inline(inline):
+    def handler():
+        return get_ident()
+
+    if inline:
+        handler = run_inline(handler)
+    assert (await run_async_or_thread(handler) == get_ident()) == inline
+
+
+JSON_ENCODERS = {
+    'argnames': 'encoder,response_class',
+    'argvalues': [(dumps_json, JSONResponse), (dumps_orjson, ORJSONResponse)],
+    'ids': ['json', 'orjson'],
+}
+
+
+@pytest.mark.parametrize(**JSON_ENCODERS)
+def test_dumps_json(encoder, response_class):
+    data = {'id': uuid4(), 'created': datetime.now(), 'tags': ('a', 'б'), 'count': 1}
+    assert json.loads(encoder(data)) == jsonable_encoder(data)
+
+
+@pytest.mark.parametrize(**JSON_ENCODERS)
+@pytest.mark.parametrize(
+    'value',
+    [
+        Decimal('1.10'),
+        datetime(2020, 1, 1, tzinfo=timezone.utc),
+        datetime(2020, 1, 1, 12, 30, tzinfo=timezone(timedelta(hours=3))),
+        time(12, 30, tzinfo=timezone.utc),
+        timedelta(seconds=1.5),
+        {uuid4(): 'uuid_key'},
+        {True: 'bool_key', None: 'null_key'},
+        [1e20, 1e-7],
+    ],
+    ids=[
+        'decimal',
+        'utc_datetime',
+        'aware_datetime',
+        'utc_time',
+        'timedelta',
+        'uuid_key',
+        'literal_keys',
+        'floats',
+    ],
+)
+def test_dumps_json_as_response(value, encoder, response_class):
+    data = {'value': value}
+    assert encoder(data) == response_class(jsonable_encoder(data)).body
+
+
+@pytest.mark.parametrize('value', [float('nan'), float('inf')], ids=['nan', 'inf'])
+def test_dumps_json_out_of_range_floats(value):
+    data = {'value': value}
+    with pytest.raises(ValueError):
+        dumps_json(data)
+    assert dumps_orjson(data) == ORJSONResponse(jsonable_encoder(data)).body
+
+
+def test_flagged_members_names():
+    def flagged(func):
+        func.is_flagged = True
+        return func
+
+    class Base:
+        @flagged
+        def second(self):
+            ...
+
+        @staticmethod
+        @flagged
+        def first():
+            ...
+
+    class Child(Base):
+        is_flagged = True
+
+        def second(self):
+            ...
+
+        @flagged
+        def third(self):
+            ...
+
+    assert get_flagged_members_names(Base, 'is_flagged') == ('first', 'second')
+    assert get_flagged_members_names(Child, 'is_flagged') == ('first', 'third')
@@ -1,6 +1,14 @@
-from pytest import mark
+from pytest import mark, raises
 
-from freddie.db.queries import Prefetch, prefetch_related
+from freddie.db.queries import (
+    PREFETCH_JOIN,
+    PREFETCH_SEPARATE,
+    Prefetch,
+    add_related,
+    get_related,
+    iter_objects,
+    prefetch_related,
+)
 
 from .app import Author, AuthorTags
 from .factories import AuthorFactory, TagFactory
@@ -9,16 +17,48 @@ pytestmark = [mark.asyncio, mark.db]
 
 
 class TestManyToManyModelViewSet:
-    async def test_prefetched_relations(self):
+    @mark.parametrize('strategy', [PREFETCH_JOIN, PREFETCH_SEPARATE])
+    async def test_prefetched_relations(self, strategy):
         author = AuthorFactory.create()
         watched_tag, ignored_tag = TagFactory.create_batch(2)
         AuthorTags(author=author, tag=watched_tag, is_notifications_on=True).save()
         AuthorTags(author=author, tag=ignored_tag, is_notifications_on=False).save()
 
         prefetcher = Prefetch(
-            field=Author.tags, attr_name='tags', relation_fields=['is_notifications_on']
+            field=Author.tags,
+            attr_name='tags',
+            relation_fields=['is_notifications_on'],
+            strategy=strategy,
         )
         author = await prefetch_related([author], [prefetcher]).__anext__()
 
         expected = set(map(lambda x: (x.id, x.is_notifications_on), author.tags))
         assert expected == {(watched_tag.id, True), (ignored_tag.id, False)}
+
+
+def test_prefetch_invalid_strategy():
+    with raises(ValueError):
+        Prefetch(field=Author.tags, attr_name='tags', strategy='unknown')
+
+
+async def test_iter_objects():
+    authors = AuthorFactory.create_batch(3)
+    results = await Author.manager.execute(Author.select().order_by(Author.id))
+    objects = iter_objects(results)
+    assert [author.id for author in objects] == [author.id for author in authors]
+    assert next(objects, None) is None
+
+
+async def test_related_fetched_within_transaction():
+    author = AuthorFactory.create()
+    tags = TagFactory.create_batch(2)
+    tags_ids = tuple(tag.id for tag in tags)
+    config = [
+        Prefetch(field=Author.tags, attr_name='tags'),
+        Prefetch(field=Author.tags, attr_name='tags_ids', ids_only=True),
+    ]
+    async with Author.manager.atomic():
+        await add_related(author.id, Author.tags, tags_ids)
+        related = await get_related(author.id, config)
+    assert sorted(tag.id for tag in related['tags']) == sorted(tags_ids)
+    assert sorted(related['tags_ids']) == sorted(tags_ids)
@@ -1,12 +1,17 @@
+import json
+from asyncio import sleep
 from enum import Enum
 from typing import Iterable, Union, Optional
 from uuid import UUID, uuid4
 
 from pydantic import Field, constr
-from pytest import mark, raises
+from pytest import mark, raises, warns
 
+from freddie import schemas
 from freddie.schemas import ApiComponentName, Schema
 
+from .app import Tag
+
 SHORT_STRING_LEN = 42
 LONG_STRING_LEN = 146
 
@@ -64,6 +69,18 @@ class TestSchemaFields:
         assert ModelWithFieldsConf.get_read_only_fields() == {'id'}
         assert ModelWithFieldsConf.get_writable_fields() == {'title', 'content', 'meta'}
 
+    def test_unknown_config_fields(self):
+        with warns(UserWarning, match='unknown fields'):
+
+            class WithUnknownField(Schema):
+                title: str
+
+                class Config:
+                    read_only_fields = {'title', 'unknown'}
+
+        assert WithUnknownField.get_config().read_only_fields == frozenset({'title', 'unknown'})
+        assert WithUnknownField.get_read_only_fields() == {'title'}
+
     def test_write_only_fields_config(self):
         assert Model.get_write_only_fields() == set()
         assert Model.get_readable_fields() == {'id', 'title', 'content', 'meta'}
@@ -120,7 +137,18 @@ class TestSchemaFields:
         assert result == 'default'
 
 
-@mark.parametrize('component_name', [42, 'kebab-cased-name', 'illegal chars*', 'кулебяка', ''])
+@mark.parametrize(
+    'schema,native',
+    [(ModelMeta, True), (Model, False), (Constrained, False), (ModelWithNested, False)],
+    ids=['native', 'union', 'enum', 'nested'],
+)
+def test_json_native_fields_detection(schema, native):
+    assert schema._has_json_native_fields() is native
+
+
+@mark.parametrize(
+    'component_name', [42, 'kebab-cased-name', 'illegal chars*', 'кулебяка', '\u212aelvin', '']
+)
 def test_invalid_vschema_component_names(component_name):
     with raises((TypeError, ValueError)):
         ApiComponentName.validate(component_name)
@@ -184,6 +212,112 @@ async def test_simple_serialization(data, expected):
     assert await Model.serialize(data) == expected
 
 
+@mark.asyncio
+@mark.parametrize(
+    'data,expected',
+    [
+        (datagenerator(as_dict=False), model_data_list),
+        (async_datagenerator(as_dict=False), model_data_list),
+        ([], []),
+    ],
+    ids=['generator_of_models', 'async_generator_of_models', 'empty'],
+)
+async def test_stream_serialization(data, expected):
+    chunks = [chunk async for chunk in Model.serialize_stream(data)]
+    assert json.loads(b''.join(chunks)) == expected
+
+
+@mark.asyncio
+async def test_stream_serialization_chunks(monkeypatch):
+    monkeypatch.setattr(schemas, 'STREAM_CHUNK_SIZE', 1)
+    chunks = [chunk async for chunk in Model.serialize_stream(datagenerator(as_dict=False))]
+    assert len(chunks) == len(model_data_list) + 1
+    assert json.loads(b''.join(chunks)) == model_data_list
+
+
+@mark.asyncio
+async def test_concurrent_serialization():
+    running = []
+
+    class Obj:
+        def __init__(self, id):
+            self.id = id
+            self.title = 'Title'
+
+        async def content(self):
+            running.append(self.id)
+            await sleep(0)
+            assert len(running) > 1
+            return str(self.id)
+
+    class ConcurrentModel(Model):
+        class Config:
+            serialize_concurrency = 16
+
+    objects = [Obj(id) for id in range(5)]
+    serialized = await ConcurrentModel.serialize(objects, fields={'id': set(), 'content': set()})
+    assert serialized == [{'id': id, 'content': str(id)} for id in range(5)]
+
+
+@mark.asyncio
+async def test_serialization_within_transaction():
+    class Obj:
+        def __init__(self, id):
+            self.id = id
+            self.title = 'Title'
+
+        async def content(self):
+            return str(await Tag.manager.count(Tag.select()))
+
+    async with Tag.manager.atomic():
+        await Tag.manager.create(Tag, name='Tag', slug='tag')
+        serialized = await Model.serialize(
+            [Obj(id) for id in range(3)], fields={'id': set(), 'content': set()}
+        )
+    assert serialized == [{'id': id, 'content': '1'} for id in range(3)]
+
+
+@mark.asyncio
+@mark.filterwarnings('error::RuntimeWarning')
+async def test_async_properties_evaluated_once():
+    calls = []
+
+    class Obj:
+        def __init__(self, id):
+            self.id = id
+
+        @property
+        def title(self):
+            calls.append(('title', self.id))
+            return 'Title'
+
+        @property
+        async def content(self):
+            calls.append(('content', self.id))
+            return str(self.id)
+
+    fields = {'id': set(), 'title': set(), 'content': set()}
+    serialized = await Model.serialize([Obj(1), Obj(2)], fields=fields)
+    assert serialized == [{'id': id, 'title': 'Title', 'content': str(id)} for id in (1, 2)]
+    assert sorted(calls) == sorted((name, id) for name in ('title', 'content') for id in (1, 2))
+
+
+@mark.asyncio
+async def test_async_types_tracked_per_plan():
+    class Obj:
+        id = 42
+        title = 'Title'
+
+        async def content(self):
+            return 'Content'
+
+    serialized = await ModelWithFieldsConf.serialize(Obj(), fields={'content': set()})
+    assert serialized == {'content': 'Content'}
+    plan = ModelWithFieldsConf._get_serialization_plan(None, full=False)
+    assert ModelWithFieldsConf._serialize_sync(Obj(), plan) == {'id': 42, 'title': 'Title'}
+    assert Obj in plan.checked_types and Obj not in plan.async_types
+
+
 model_data_nested = {'nested': model_data_list}
 
 
@@ -226,3 +360,11 @@ conf_model_extended = ModelWithFieldsConf(**conf_model_data_extended)
 )
 async def test_configured_serialization(data, fields, expected):
     assert await ModelWithFieldsConf.serialize(data, fields=fields) == expected
+
+
+def test_serialization_plan_cached():
+    plan = ModelWithNested._get_serialization_plan(None, full=False)
+    assert plan is ModelWithNested._get_serialization_plan(None, full=False)
+    assert [field.name for field in plan] == ['nested']
+    assert plan[0].subschema is Model
+    assert plan[0].subplan is plan[0].subplan
@@ -1,22 +1,23 @@
+from asyncio import gather
 from http import HTTPStatus
 from random import choice as rand_choice
 
-from playhouse.shortcuts import model_to_dict
 from pydantic import Field, constr
 from pytest import fixture, mark, raises
 
-from freddie.db.queries import set_related
+from freddie.db.queries import set_related, set_related_bulk
 from freddie.viewsets import ModelViewSet
 
-from .app import Log, Post, PostSchema, PostTags, TagSchema
+from .app import Log, Post, PostSchema, PostSchemaOnWrite, PostTags, TagSchema
 from .factories import AuthorFactory, PostFactory, TagFactory
 from .utils import WithClient
 
-pytestmark = [mark.asyncio, mark.db]
+pytestmark = mark.db
 post_model = PostFactory._meta.model
 author_model = AuthorFactory._meta.model
 
 
+@mark.asyncio
 class ModelViewSetMixin(WithClient):
     @fixture(scope='function', autouse=True)
     def _add_related_items(self):
@@ -38,16 +39,16 @@ class TestSimpleModelViewSet(ModelViewSetMixin):
         first_chunk_size = 5
         second_chunk_size = 3
         posts = PostFactory.create_batch(size=first_chunk_size + second_chunk_size)
-        response = await self.client.get('/post/', query_string={'limit': first_chunk_size})
-        assert response.status_code == HTTPStatus.OK
-        response_data = response.json()
-        assert len(response_data) == first_chunk_size
-        assert response_data == await PostSchema.serialize(posts[:first_chunk_size])
-        response = await self.client.get('/post/', query_string={'offset': first_chunk_size})
-        assert response.status_code == HTTPStatus.OK
-        response_data = response.json()
-        assert len(response_data) == second_chunk_size
-        assert response_data == await PostSchema.serialize(posts[first_chunk_size:])
+        responses = await gather(
+            self.client.get('/post/', query_string={'limit': first_chunk_size}),
+            self.client.get('/post/', query_string={'offset': first_chunk_size}),
+        )
+        chunks = (posts[:first_chunk_size], posts[first_chunk_size:])
+        for response, chunk in zip(responses, chunks):
+            assert response.status_code == HTTPStatus.OK
+            response_data = response.json()
+            assert len(response_data) == len(chunk)
+            assert response_data == await PostSchema.serialize(chunk)
 
     @fixture
     def slugs(self):
@@ -211,14 +212,31 @@ class TestManyToManyModelViewSet(ModelViewSetMixin):
     async def test_prefetched_relations(self):
         posts = PostFactory.create_batch(size=3)
         tags = await TagSchema.serialize(self.tags)
-        for post in posts:
-            await set_related(post.id, type(post).tags, (tag.id for tag in self.tags))
+        tags_ids = [tag.id for tag in self.tags]
+        await set_related_bulk(Post.tags, ((post.id, tags_ids) for post in posts))
         response = await self.client.get('/post/')
         assert response.status_code == HTTPStatus.OK
         response_data = response.json()
         for post in response_data:
             assert post['tags'] == tags
 
+    async def test_prefetched_relations_ids(self):
+        post, post_without_tags = PostFactory.create_batch(size=2)
+        await set_related(post.id, Post.tags, (tag.id for tag in self.tags))
+        response = await self.client.get('/post/', query_string={'fields': 'tags_ids'})
+        assert response.status_code == HTTPStatus.OK
+        tags_ids = {item['id']: item['tags_ids'] for item in response.json()}
+        assert sorted(tags_ids[post.id]) == sorted(tag.id for tag in self.tags)
+        assert tags_ids[post_without_tags.id] == []
+
+    @mark.parametrize('pk_attr', ['id', 'slug'])
+    async def test_retrieve_with_relations(self, pk_attr):
+        post = PostFactory()
+        await set_related(post.id, Post.tags, (tag.id for tag in self.tags))
+        response = await self.client.get(f'/post/{getattr(post, pk_attr)}')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['tags'] == await TagSchema.serialize(self.tags)
+
     async def test_create_entry_with_relations(self):
         tags_ids = [tag.id for tag in self.tags]
         post_data = {
@@ -236,7 +254,7 @@ class TestManyToManyModelViewSet(ModelViewSetMixin):
 
     async def test_update_entry_relations(self):
         post = PostFactory()
-        await set_related(post.id, type(post).tags, (tag.id for tag in self.tags))
+        await set_related(post.id, Post.tags, (tag.id for tag in self.tags))
         updated_tags = TagFactory.create_batch(size=3)
         response = await self.client.patch(
             f'/post/{post.id}', json={'tags_ids': [tag.id for tag in updated_tags]}
@@ -245,10 +263,30 @@ class TestManyToManyModelViewSet(ModelViewSetMixin):
         assert response_data['tags'] == await TagSchema.serialize(updated_tags, full=True)
         assert response.status_code == HTTPStatus.OK
 
+    async def test_update_relations_within_transaction(self):
+        post = PostFactory()
+        tags_ids = [tag.id for tag in self.tags]
+        body = PostSchemaOnWrite.construct(_fields_set={'tags_ids'}, tags_ids=tags_ids)
+        viewset = ModelViewSet(model=Post, schema=PostSchema, write_schema=PostSchemaOnWrite)
+        with raises(RuntimeError):
+            async with Post.manager.atomic():
+                await viewset.update(post.id, body, request=None)
+                raise RuntimeError
+        assert not PostTags.select().where(PostTags.post == post.id).exists()
+
+    async def test_bulk_set_related(self):
+        posts = PostFactory.create_batch(size=3)
+        await set_related(posts[0].id, Post.tags, (tag.id for tag in self.tags))
+        tags_ids = [tag.id for tag in self.tags[:2]]
+        await set_related_bulk(Post.tags, ((post.id, tags_ids) for post in posts))
+        for post in posts:
+            relations = PostTags.select().where(PostTags.post == post.id)
+            assert sorted(rel.tag_id for rel in relations) == sorted(tags_ids)
+
     def test_actions_with_field_attr(self):
         post = PostFactory()
         tags_ids = [tag.id for tag in self.tags]
-        builder = type(post).tags(post.id)
+        builder = Post.tags(post.id)
         with raises(ValueError):
             builder.add()
         builder.add(*tags_ids).execute()
@@ -286,11 +324,12 @@ def test_model_select_only_method(selected, expected):
     post = PostFactory(author=author)
     query = post_model.select_only(*selected).where(post_model.id << [post.id])
     for post in query.execute():
-        for key, value in model_to_dict(post).items():
+        for key in post_model._meta.fields:
             is_none = key not in expected
-            assert (value is None) == is_none
+            assert (post.__data__.get(key) is None) == is_none
 
 
+@mark.asyncio
 @mark.parametrize('pk', [100500, 'unslug'])
 async def test_notfound(client, pk):
     response = await client.get(f'/post/{pk}')
@@ -306,5 +345,67 @@ def test_incomplete_schema(field_type, default_value):
     class PostIncomplete(PostSchema):
         title: field_type = default_value
 
-    with raises(AssertionError):
+    with raises(AssertionError, match=r'^PostIncomplete\.title '):
         ModelViewSet(model=Post, schema=PostIncomplete)
+
+
+@mark.parametrize('fields', [None, {'title': set(), 'author': set()}], ids=['default', 'custom'])
+def test_base_query_not_modified(fields):
+    viewset = ModelViewSet(model=Post, schema=PostSchema)
+    base_joins = {
+        source: list(joins)
+        for source, joins in viewset.construct_query(None, fields)._joins.items()
+    }
+    for _ in range(3):
+        query = viewset.construct_query(None, fields).switch(post_model)
+        query.join(author_model, on=(post_model.author == author_model.id))
+    assert viewset.construct_query(None, fields)._joins == base_joins
+
+
+def test_select_plan_reused():
+    viewset = ModelViewSet(model=Post, schema=PostSchema)
+    plan = viewset.get_select_plan({'title': set(), 'author': set()})
+    assert plan is viewset.get_select_plan(['author', 'title'])
+    selected, joined = plan
+    assert post_model.title in selected and joined == (author_model,)
+
+
+def test_prefetch_config_reused():
+    viewset = ModelViewSet(model=Post, schema=PostSchema)
+    config = viewset.get_prefetch_config({'title': set(), 'tags': set()})
+    assert config is viewset.get_prefetch_config({'tags': {'id'}, 'title': set()})
+    assert [prefetch.attr_name for prefetch in config] == ['tags']
+
+
+def test_prefetch_config_overridden():
+    received = []
+
+    class PostViewSet(ModelViewSet):
+        def build_prefetch_config(self, fields):
+            received.append(fields)
+            return super().build_prefetch_config(fields)
+
+    viewset = PostViewSet(model=Post, schema=PostSchema)
+    fields = {'title': set(), 'tags': {'id'}}
+    viewset.get_prefetch_config(fields)
+    viewset.get_prefetch_config(fields)
+    assert received == [fields, fields]
+
+
+def test_related_columns_narrowed():
+    viewset = ModelViewSet(model=Post, schema=PostSchema)
+    columns = viewset.get_related_columns('author', post_model.author)
+    assert set(columns) == {
+        author_model.id,
+        author_model.first_name,
+        author_model.last_name,
+        author_model.nickname,
+    }
+
+
+def test_default_query_prebuilt():
+    viewset = ModelViewSet(model=Post, schema=PostSchema)
+    fields = viewset._response_fields_default_config
+    query = viewset.construct_query(None, dict(fields))
+    assert query is not viewset._base_queries[frozenset(fields)]
+    assert query.sql() == viewset.build_query(fields).sql()
@@ -1,4 +1,5 @@
 from http import HTTPStatus
+from urllib.parse import urlencode
 
 from pytest import mark
 
@@ -10,10 +11,15 @@ from .utils import WithClient
 pytestmark = mark.asyncio
 api_prefixes = {
     'argnames': 'prefix',
-    'argvalues': ['/unvalidated', '/validated', '/sync'],
-    'ids': ['unvalidated', 'validated', 'synchronous'],
+    'argvalues': ['/unvalidated', '/validated', '/sync', '/streamed'],
+    'ids': ['unvalidated', 'validated', 'synchronous', 'streamed'],
 }
 pk = 42
+api_detail_urls = {
+    'argnames': 'url',
+    'argvalues': [f'{prefix}/{pk}' for prefix in api_prefixes['argvalues']],
+    'ids': api_prefixes['ids'],
+}
 
 
 class TestBasicViewSet(WithClient):
@@ -35,9 +41,9 @@ class TestBasicViewSet(WithClient):
         assert response.status_code == HTTPStatus.OK
         assert response.json() == await Item.serialize(test_items_seq)
 
-    @mark.parametrize(**api_prefixes)
-    async def test_retrieve(self, prefix):
-        response = await self.client.get(f'{prefix}/{pk}')
+    @mark.parametrize(**api_detail_urls)
+    async def test_retrieve(self, url):
+        response = await self.client.get(url)
         assert response.status_code == HTTPStatus.OK
         assert response.json() == await test_item.get_serialized()
 
@@ -54,28 +60,29 @@ class TestBasicViewSet(WithClient):
         assert response.status_code == HTTPStatus.CREATED
         assert response.json() == await created_item.get_serialized()
 
-    @mark.parametrize(**api_prefixes)
-    async def test_update(self, prefix):
+    @mark.parametrize(**api_detail_urls)
+    async def test_update(self, url):
         updated_item = Item(title='Yello')
-        response = await self.client.put(f'{prefix}/{pk}', json=updated_item.dict())
+        response = await self.client.put(url, json=updated_item.dict())
         assert response.status_code == HTTPStatus.OK
         assert response.json() == await updated_item.get_serialized()
 
-    @mark.parametrize(**api_prefixes)
-    async def test_update_partial(self, prefix):
+    @mark.parametrize(**api_detail_urls)
+    async def test_update_partial(self, url):
         data = {'title': 'OK'}
         updated_item = Item(**data)
-        response = await self.client.patch(f'{prefix}/{pk}', json=data)
+        response = await self.client.patch(url, json=data)
         assert response.status_code == HTTPStatus.OK
         assert response.json() == await updated_item.get_serialized()
 
-    @mark.parametrize(**api_prefixes)
-    async def test_destroy(self, prefix):
-        response = await self.client.delete(f'{prefix}/{pk}')
+    @mark.parametrize(**api_detail_urls)
+    async def test_destroy(self, url):
+        response = await self.client.delete(url)
         assert response.status_code == HTTPStatus.NO_CONTENT
         assert response.text == ''
 
     ROUTE_QUERY_PARAMS = {'foo': 'one', 'bar': 42}
+    ROUTE_QUERY_STRING = urlencode(ROUTE_QUERY_PARAMS)
 
     @mark.parametrize(
         'path',
@@ -90,10 +97,15 @@ class TestBasicViewSet(WithClient):
     async def test_custom_route(self, path):
         invalid_response = await self.client.get(path)
         assert invalid_response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
-        response = await self.client.get(path, query_string=self.ROUTE_QUERY_PARAMS)
+        response = await self.client.get(f'{path}?{self.ROUTE_QUERY_STRING}')
         assert response.status_code == HTTPStatus.OK
         assert response.json() == self.ROUTE_QUERY_PARAMS
 
+    async def test_streamed_list_error(self):
+        response = await self.client.get('/streamed-gone/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert response.json() == {'detail': 'gone'}
+
 
 class TestPaginatedViewSet(WithClient):
     @mark.parametrize(
@@ -1,3 +1,5 @@
+from atexit import register as register_atexit
+from functools import lru_cache
 from typing import Type
 
 from factory import Factory
@@ -34,10 +36,23 @@ class BaseFactory(Factory):
         model = target_class.create(**kwargs)
         return model
 
+    @classmethod
+    def create_batch(cls, size, **kwargs):
+        # Batch is inserted with a single statement instead of one per object
+        objects = cls.build_batch(size, **kwargs)
+        cls._meta.model.bulk_create(objects)
+        return objects
 
-def run_sql(query, database='postgres'):
+
+@lru_cache(maxsize=None)
+def _connect(database):
+    # Connection is kept open for the whole session instead of reconnecting on each query
     conn = pg_connect(database=database)
     conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-    cur = conn.cursor()
-    cur.execute(query)
-    conn.close()
+    register_atexit(conn.close)
+    return conn
+
+
+def run_sql(query, database='postgres'):
+    with _connect(database).cursor() as cur:
+        cur.execute(query)